@@ -0,0 +1,53 @@
+# Measures how long it takes to tear down a task group whose children are all waiting
+# (half of them on ring operations, half on an event) as the fan-out grows. The time
+# per task should stay flat; pass --no-gc to keep collector pauses (which grow with the
+# number of live objects) out of the figures.
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+
+import asyncfusion
+
+
+async def sleep_forever() -> None:
+    await asyncfusion.sleep(3600)
+
+
+async def measure(count: int) -> None:
+    event = asyncfusion.Event()
+    with asyncfusion.CancelScope() as scope:
+        async with asyncfusion.TaskGroup() as tg:
+            for i in range(count):
+                if i % 2:
+                    tg.create_task(sleep_forever())
+                else:
+                    tg.create_task(event.wait())
+
+            # Let every task run up to the point where it waits
+            await asyncfusion.sleep(0)
+            start = time.perf_counter()
+            scope.cancel()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{count:>8} tasks: teardown took {elapsed * 1000:8.2f} ms "
+        f"({elapsed / count * 1_000_000:.2f} us per task)"
+    )
+
+
+async def main(counts: list[int]) -> None:
+    for count in counts:
+        await measure(count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("counts", nargs="*", type=int, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--no-gc", action="store_true")
+    args = parser.parse_args()
+    if args.no_gc:
+        gc.disable()
+
+    asyncfusion.run(main(args.counts))
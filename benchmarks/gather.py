@@ -0,0 +1,50 @@
+# Measures a wide asyncio.gather() (each child yielding to the event loop once) on the
+# asyncio shim, compared against stdlib asyncio
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from types import ModuleType
+
+from asyncfusion.shims import asyncio as asyncio_shim
+
+
+async def child(asyncio_module: ModuleType, value: int) -> int:
+    await asyncio_module.sleep(0)
+    return value
+
+
+async def measure(asyncio_module: ModuleType, count: int, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = await asyncio_module.gather(
+            *[child(asyncio_module, i) for i in range(count)]
+        )
+        best = min(best, time.perf_counter() - start)
+        assert results == list(range(count))
+
+    return best
+
+
+def report(name: str, count: int, elapsed: float) -> None:
+    print(
+        f"{name:>12}: {count}-way gather took {elapsed * 1000:8.2f} ms "
+        f"({elapsed / count * 1_000_000:.2f} us per child)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--tasks", type=int, default=10_000)
+    parser.add_argument("-r", "--rounds", type=int, default=5)
+    args = parser.parse_args()
+    elapsed = asyncio_shim.run(measure(asyncio_shim, args.tasks, args.rounds))
+    report("asyncfusion", args.tasks, elapsed)
+    elapsed = asyncio.run(measure(asyncio, args.tasks, args.rounds))
+    report("asyncio", args.tasks, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Measures the memory held by a large number of idle tasks (each waiting on an event),
+# as with a server that keeps one task per open connection
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import asyncfusion
+
+
+async def idle(wait: Callable[[], Awaitable[Any]]) -> None:
+    await wait()
+
+
+def report(name: str, count: int, memory: int) -> None:
+    print(f"{name:>12}: {memory / count:5.0f} bytes per idle task ({count} tasks)")
+
+
+async def asyncfusion_main(count: int) -> None:
+    event = asyncfusion.Event()
+    gc.collect()
+    tracemalloc.start()
+    async with asyncfusion.TaskGroup() as tg:
+        for _ in range(count):
+            tg.create_task(idle(event.wait))
+
+        # Let every task run up to the point where it waits on the event
+        await asyncfusion.sleep(0)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        event.set()
+
+    report("asyncfusion", count, memory)
+
+
+async def asyncio_main(count: int) -> None:
+    event = asyncio.Event()
+    gc.collect()
+    tracemalloc.start()
+    tasks = [asyncio.create_task(idle(event.wait)) for _ in range(count)]
+    await asyncio.sleep(0)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    event.set()
+    await asyncio.gather(*tasks)
+    report("asyncio", count, memory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--tasks", type=int, default=1_000_000)
+    parser.add_argument(
+        "--asyncio", action="store_true", help="also measure stdlib asyncio tasks"
+    )
+    args = parser.parse_args()
+    asyncfusion.run(asyncfusion_main(args.tasks))
+    if args.asyncio:
+        asyncio.run(asyncio_main(args.tasks))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,27 @@ from __future__ import annotations
 
 from typing import Any
 
+from . import to_process as to_process
+from . import to_thread as to_thread
+from ._clock import Clock as Clock
+from ._clock import MockClock as MockClock
+from ._clock import SystemClock as SystemClock
 from ._eventloop import EventLoop as EventLoop
+from ._eventloop import checkpoint as checkpoint
 from ._eventloop import current_event_loop as current_event_loop
+from ._eventloop import current_task as current_task
 from ._eventloop import current_time as current_time
 from ._eventloop import run as run
 from ._eventloop import sleep as sleep
+from ._exceptions import BrokenWorkerProcess as BrokenWorkerProcess
 from ._exceptions import CancelledError as CancelledError
 from ._exceptions import InvalidStateError as InvalidStateError
-from ._futures import Future
+from ._exceptions import WouldBlock as WouldBlock
+from ._futures import Future as Future
 from ._importhook import install as install
+from ._pool import LoopPool as LoopPool
 from ._sockets import AsyncSocket as AsyncSocket
+from ._sockets import connect_tcp as connect_tcp
 from ._synchronization import CapacityLimiter as CapacityLimiter
 from ._synchronization import Event as Event
 from ._synchronization import Lock as Lock
@@ -19,6 +30,8 @@ from ._synchronization import Semaphore as Semaphore
 from ._tasks import CancelScope as CancelScope
 from ._tasks import Task as Task
 from ._tasks import TaskGroup as TaskGroup
+from ._tasks import as_completed as as_completed
+from ._tasks import gather as gather
 
 # Re-export imports so they look like they live directly in this package
 key: str
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import sys
 from argparse import ArgumentParser
+from functools import partial
 from runpy import run_module, run_path
 
-from asyncfusion import install
+from asyncfusion import _sockets, install
 
 
 def main() -> None:
@@ -24,17 +26,38 @@ def main() -> None:
         action="store_true",
         help="Print a debug message each time an import is diverted by the import hook",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Run the script in N forked worker processes, restarting any that crash; "
+            "sockets bound through asyncfusion use SO_REUSEPORT so that the kernel "
+            "distributes incoming connections between the workers"
+        ),
+    )
     parser.add_argument(
         "name",
         help="Script file name to run, or module name if the -m option was given",
     )
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("the number of workers must be at least 1")
 
     install(debug=args.debug)
     if args.m:
-        run_module(args.name, run_name="__main__")
+        target = partial(run_module, args.name, run_name="__main__")
     else:
-        run_path(args.name, run_name="__main__")
+        target = partial(run_path, args.name, run_name="__main__")
+
+    if args.workers == 1:
+        target()
+    else:
+        from ._workers import WorkerSupervisor
+
+        _sockets.reuse_port = True
+        sys.exit(WorkerSupervisor(target, args.workers).run())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+from abc import ABCMeta, abstractmethod
+from math import inf
+
+
+class Clock(metaclass=ABCMeta):
+    __slots__ = ()
+
+    @abstractmethod
+    def start_clock(self) -> None: ...
+
+    @abstractmethod
+    def current_time(self) -> float: ...
+
+    # How many real seconds to sleep to reach the given deadline (inf to sleep until
+    # woken up by something else)
+    @abstractmethod
+    def deadline_to_sleep_time(self, deadline: float) -> float: ...
+
+
+class SystemClock(Clock):
+    # The system's monotonic clock, counted from the given starting point
+    __slots__ = ("_start_time",)
+
+    def __init__(self, start_time: float | None = None) -> None:
+        self._start_time = time.monotonic() if start_time is None else start_time
+
+    def start_clock(self) -> None:
+        pass
+
+    def current_time(self) -> float:
+        return time.monotonic() - self._start_time
+
+    def deadline_to_sleep_time(self, deadline: float) -> float:
+        return deadline - self.current_time()
+
+
+class MockClock(Clock):
+    # A virtual clock that runs at the given rate relative to real time (0 to stand
+    # still), and that is jumped ahead to the next timer once the event loop has been
+    # idle for autojump_threshold real seconds
+    __slots__ = ("_rate", "_autojump_threshold", "_real_base", "_virtual_base")
+
+    def __init__(self, rate: float = 0.0, autojump_threshold: float = inf) -> None:
+        self._real_base = 0.0
+        self._virtual_base = 0.0
+        self._rate = 0.0
+        self._autojump_threshold = inf
+        self.rate = rate
+        self.autojump_threshold = autojump_threshold
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} time={self.current_time()}, "
+            f"rate={self._rate}, autojump_threshold={self._autojump_threshold}>"
+        )
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @rate.setter
+    def rate(self, value: float) -> None:
+        if value < 0:
+            raise ValueError("rate must be >= 0")
+
+        # Rebase, so that the time doesn't jump when the rate changes
+        real = time.perf_counter()
+        self._virtual_base = self._real_to_virtual(real)
+        self._real_base = real
+        self._rate = float(value)
+
+    @property
+    def autojump_threshold(self) -> float:
+        return self._autojump_threshold
+
+    @autojump_threshold.setter
+    def autojump_threshold(self, value: float) -> None:
+        if value < 0:
+            raise ValueError("autojump_threshold must be >= 0")
+
+        self._autojump_threshold = float(value)
+
+    def _real_to_virtual(self, real: float) -> float:
+        return self._virtual_base + self._rate * (real - self._real_base)
+
+    def start_clock(self) -> None:
+        pass
+
+    def current_time(self) -> float:
+        return self._real_to_virtual(time.perf_counter())
+
+    def deadline_to_sleep_time(self, deadline: float) -> float:
+        virtual_timeout = deadline - self.current_time()
+        if virtual_timeout <= 0:
+            return 0
+        elif self._rate > 0:
+            return virtual_timeout / self._rate
+        else:
+            return inf
+
+    def jump(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError("time can't go backwards")
+
+        self._virtual_base += seconds
+
+    def _autojump(self, deadline: float) -> None:
+        if (delta := deadline - self.current_time()) > 0:
+            self.jump(delta)
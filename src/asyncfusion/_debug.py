@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from ._tasks import Task
+
+# Values are bucketed by their power of two, and each power of two is split into
+# 2**(HISTOGRAM_PRECISION_BITS - 1) linear sub-buckets, for a relative error of at
+# most 1 / 2**(HISTOGRAM_PRECISION_BITS - 1)
+HISTOGRAM_PRECISION_BITS = 5
+_SUB_BUCKETS = 1 << HISTOGRAM_PRECISION_BITS
+_HALF_SUB_BUCKETS = _SUB_BUCKETS >> 1
+
+
+@dataclass(frozen=True)
+class SlowCallback:
+    # The loop time when the callback finished, and how long it ran (in seconds)
+    time: float
+    duration: float
+    callback: str
+    task_name: str | None
+    # Where the task's coroutine was suspended afterwards (None if it finished)
+    frame: str | None
+
+
+class LatencyHistogram:
+    # An HDR style histogram of durations, recorded with microsecond resolution
+    __slots__ = ("_counts", "_count", "_max")
+
+    def __init__(self) -> None:
+        self._counts: list[int] = []
+        self._count = 0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    def record(self, duration: float) -> None:
+        value = int(duration * 1_000_000)
+        if value < _SUB_BUCKETS:
+            index = value
+        else:
+            shift = value.bit_length() - HISTOGRAM_PRECISION_BITS
+            index = shift * _HALF_SUB_BUCKETS + (value >> shift)
+
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+
+        counts[index] += 1
+        self._count += 1
+        if duration > self._max:
+            self._max = duration
+
+    def percentile(self, percent: float) -> float:
+        # Return the upper bound of the bucket holding the given percentile
+        threshold = self._count * percent / 100
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen and seen >= threshold:
+                return min(_bucket_start(index + 1) / 1_000_000, self._max)
+
+        return self._max
+
+
+def _bucket_start(index: int) -> int:
+    if index < _SUB_BUCKETS:
+        return index
+
+    shift = index // _HALF_SUB_BUCKETS - 1
+    return (index % _HALF_SUB_BUCKETS + _HALF_SUB_BUCKETS) << shift
+
+
+def describe_frame(coro: Any) -> str | None:
+    # Follow the chain of awaits down to the innermost suspended coroutine (which is
+    # where the code awaiting a future or a checkpoint is)
+    frame = None
+    while (next_frame := getattr(coro, "cr_frame", None)) is not None:
+        frame = next_frame
+        coro = coro.cr_await
+
+    if frame is None:
+        return None
+
+    code = frame.f_code
+    return f'File "{code.co_filename}", line {frame.f_lineno}, in {code.co_name}'
+
+
+def describe_slow_callback(
+    callback: Any, finished_at: float, duration: float
+) -> SlowCallback:
+    if isinstance(callback, Task):
+        return SlowCallback(
+            finished_at,
+            duration,
+            repr(callback._coro),
+            callback.name,
+            None if callback.done() else describe_frame(callback._coro),
+        )
+
+    return SlowCallback(finished_at, duration, repr(callback), None, None)
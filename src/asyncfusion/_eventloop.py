@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import os
+import signal
 import sys
 import time
-from collections.abc import Awaitable, Callable, Coroutine
-from contextvars import ContextVar
+from collections import deque
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Coroutine,
+    Generator,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from dataclasses import dataclass
+from functools import partial
+from heapq import heapify, heappop, heappush
+from itertools import count
+from math import inf
+from operator import attrgetter
 from socket import socket
-from types import SimpleNamespace
-from typing import TYPE_CHECKING, Any, TypeVar
+from types import FrameType, coroutine
+from typing import TYPE_CHECKING, Any, TextIO, TypeVar
 
-from ._futures import Future
-from ._tasks import Task
-from ._utils import infinite
+from ._clock import Clock, MockClock, SystemClock
+from ._debug import LatencyHistogram, SlowCallback, describe_slow_callback
+from ._exceptions import CancelledError
+from ._futures import MAX_SYNC_COMPLETIONS, Future
+from ._tasks import CancelScope, Task
+from ._timerwheel import TimerWheel
+from ._utils import current_async_library_cvar, current_event_loop_cvar, infinite
 
 if sys.version_info >= (3, 12):
     from typing import Buffer
@@ -22,17 +42,58 @@ if sys.version_info >= (3, 10):
 else:
     from typing_extensions import TypeAlias
 
-try:
-    from sniffio import thread_local as sniffio_thread_local
-except ImportError:
-    sniffio_thread_local = SimpleNamespace(name=None)  # type: ignore[assignment]
-
 if TYPE_CHECKING:
     from ._sockets import SocketAddress
+    from ._synchronization import CapacityLimiter
+    from ._watchdog import Watchdog
+    from .to_process import ProcessWorkerPool
+    from .to_thread import WorkerThreadPool
 
 T_Retval = TypeVar("T_Retval")
 AsyncCallback: TypeAlias = "Task | Callable[[], Any]"
-_current_event_loop: ContextVar[EventLoop] = ContextVar("current_event_loop")
+
+# Once this many optimistic (non-blocking) syscalls in a row have failed on a socket,
+# only one in every OPTIMISTIC_RETRY_INTERVAL operations tries that again before
+# going through the ring
+MAX_OPTIMISTIC_FAILURES = 4
+OPTIMISTIC_RETRY_INTERVAL = 16
+# The Linux clock ID of CLOCK_MONOTONIC_COARSE, which the time module doesn't expose
+CLOCK_MONOTONIC_COARSE = 6
+# The granularity (in seconds) of the timer wheel
+TIMER_RESOLUTION = 0.001
+# How many of the most recent slow callbacks are kept in debug mode
+SLOW_CALLBACK_RECORDS = 100
+
+
+@dataclass(frozen=True)
+class EventLoopStatistics:
+    steps: int
+    # The number of steps that ran out of their run budget
+    budget_exhaustions: int
+    # The number of callbacks deferred to the next step because of the run budget
+    deferred_callbacks: int
+    callbacks_scheduled: int
+    run_budget: float | None
+    # Total time spent spinning on the completion queue while idle
+    busy_poll_time: float
+    # The number of spins that ended with a completion vs. in a blocking wait
+    busy_poll_hits: int
+    busy_poll_misses: int
+    # The current, auto-tuned spin window
+    busy_poll_window: float
+
+
+@dataclass(frozen=True)
+class DebugStatistics:
+    # The most recent callbacks and task steps that ran for too long, oldest first
+    slow_callbacks: Sequence[SlowCallback]
+    # Percentiles of the loop lag, that is, how long (in seconds) each step ran
+    # callbacks before the ring was polled again
+    lag_samples: int
+    lag_p50: float
+    lag_p99: float
+    lag_p999: float
+    lag_max: float
 
 
 class DelayedCallback:
@@ -46,134 +107,882 @@ class DelayedCallback:
         return self.deadline < other.deadline
 
 
-def run(coro: Coroutine[Any, Any, T_Retval]) -> T_Retval:
-    if _current_event_loop.get(None) is not None:
+class SleepFuture(Future[None]):
+    # A sleep kept on the timer wheel rather than in the ring, so abandoning it costs
+    # no kernel work (the kernel cancels each ring timeout with a linear search)
+    __slots__ = ("_when", "_timer_slot")
+
+    def __init__(self, when: float) -> None:
+        super().__init__()
+        self._when = when
+        self._timer_slot: dict[int, Any] | None = None
+
+
+def _priority(callback: AsyncCallback) -> int:
+    return callback._priority if isinstance(callback, Task) else 0
+
+
+def run(coro: Coroutine[Any, Any, T_Retval], *, clock: Clock | None = None) -> T_Retval:
+    if current_event_loop_cvar.get(None) is not None:
         raise RuntimeError("already running in an async event loop")
 
-    return EventLoop().run_until_complete(coro)
+    return EventLoop(clock=clock).run_until_complete(coro)
 
 
 class EventLoop:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        attach_to: EventLoop | None = None,
+        optimistic_io: bool = True,
+        eager_tasks: bool = False,
+        run_budget: float | None = 0.01,
+        busy_poll: float | None = None,
+        busy_poll_check_interval: int = 64,
+        ring_mode: str = "auto",
+        coarse_clock: bool = False,
+        clock: Clock | None = None,
+        debug: bool = False,
+        slow_callback_duration: float = 0.1,
+        watchdog: float | None = None,
+    ) -> None:
         from ._io_uring import IoUring
 
         # self._tasks: set[Task] = {}
         self._scheduled_callbacks: list[AsyncCallback] = []
+        self._threadsafe_callbacks: deque[Callable[[], Any]] = deque()
         # self._delayed_callbacks: list[DelayedCallback] = []
         self._uring = IoUring()
-        self._start_time = time.monotonic()
+        self._attach_to = attach_to
+        self._eager_tasks = eager_tasks
+        # How long (in seconds) a single step may run callbacks before polling the ring
+        # again (None for no limit)
+        self._run_budget = run_budget
+        self._steps = 0
+        self._budget_exhaustions = 0
+        # The callbacks deferred to the next step by the run budget, already in order
+        self._backlog: list[AsyncCallback] = []
+        self._deferred_callbacks = 0
+        # The longest time (in seconds) to spin on the ring's completion queue before
+        # blocking when idle (None to always block right away)
+        self._busy_poll = busy_poll
+        # How many spins go by between clock checks while busy polling; with the
+        # DEFER_TASKRUN ring mode, each check also costs a syscall
+        self._busy_poll_check_interval = busy_poll_check_interval
+        # How the ring runs completion work: "defer_taskrun", "coop_taskrun", "default"
+        # or "auto" for the best one the kernel supports
+        self._ring_mode = ring_mode
+        self._current_task: Task | None = None
+        # Futures awaited synchronously since the loop last resumed a task, so that a
+        # task that keeps getting ready results can't starve others
+        self._sync_completions = 0
+        # Set once any task gets a non-default priority; until then, the ready queue is
+        # processed in plain FIFO order
+        self._priority_scheduling = False
+        # Heap of cancel scope deadlines; entries whose deadline no longer matches
+        # their scope's registered deadline are stale and skipped
+        self._deadlines: list[tuple[float, int, CancelScope]] = []
+        self._deadline_sequence = count()
+        self._stale_deadlines = 0
+        # Scopes that have been cancelled since the last delivery of cancellations
+        self._cancelled_scopes: list[CancelScope] = []
+        # The ring timeout armed for the nearest deadline
+        self._deadline_timer: Future[Any] | None = None
+        self._armed_deadline = inf
+        self._closed = False
+        self._thread_pool: WorkerThreadPool | None = None
+        self._default_thread_limiter: CapacityLimiter | None = None
+        self._process_pool: ProcessWorkerPool | None = None
+        self._default_process_limiter: CapacityLimiter | None = None
+        # time() returns the clock as sampled once per step (never ahead of the actual
+        # time); the coarse clock is cheaper to read, but only has a resolution of a
+        # few milliseconds
+        self._clock: Callable[[], float] = (
+            partial(time.clock_gettime, CLOCK_MONOTONIC_COARSE)
+            if coarse_clock
+            else time.monotonic
+        )
+        self._precise_clock: Callable[[], float] = time.monotonic
+        self._start_time = self._clock()
+        self._time = 0.0
+        # With a custom clock, the loop drives its timers and deadlines by that clock
+        # instead of arming ring timeouts for them
+        self._custom_clock = clock is not None
+        if clock is not None:
+            clock.start_clock()
+            self._clock = self._precise_clock = clock.current_time
+            self._start_time = 0.0
+            self._clock_object = clock
+        else:
+            self._clock_object = SystemClock(self._start_time)
+
+        # Heap of pending sleeps with a custom clock
+        self._timers: list[tuple[float, int, Future[None]]] = []
+        # The ring timeout that wakes up the loop for the nearest timer or deadline,
+        # with a custom clock
+        self._clock_wakeup: Future[Any] | None = None
+        # Timers added with add_timer(), expired in batches once per step
+        self._timer_wheel = TimerWheel(TIMER_RESOLUTION, self._time)
+        # The ring timeout armed for the next expiry of the timer wheel
+        self._wheel_timer: Future[Any] | None = None
+        self._wheel_armed = inf
+        # In debug mode, every callback and task step is timed, and the ones that take
+        # longer than slow_callback_duration (in seconds) are recorded
+        self._debug = debug
+        self.slow_callback_duration = slow_callback_duration
+        self._slow_callbacks: deque[SlowCallback] = deque(maxlen=SLOW_CALLBACK_RECORDS)
+        self._lag_histogram = LatencyHistogram()
+        # How long (in seconds) the loop may go without finishing a step while it's not
+        # waiting for I/O, before a watchdog thread dumps the loop thread's stack (None
+        # for no watchdog)
+        self._watchdog_threshold = watchdog
+        self._watchdog: Watchdog | None = None
+        # Set while the ring is polled, so the watchdog can tell idling from stalling
+        self._waiting = False
+        # Consecutive failed optimistic syscalls, keyed by file descriptor
+        self._optimistic_io = optimistic_io
+        self._recv_failures: dict[int, int] = {}
+        self._send_failures: dict[int, int] = {}
+
+    def _init_uring(self) -> None:
+        # Share the kernel's async worker threads with another loop, if requested
+        if self._attach_to is not None:
+            self._uring.init(self._attach_to._uring.fileno(), self._ring_mode)
+        else:
+            self._uring.init(-1, self._ring_mode)
+
+        if self._busy_poll:
+            self._uring.set_busy_poll(self._busy_poll, self._busy_poll_check_interval)
 
     def step(self) -> None:
         # print("\nstep() start")
-        old_name, sniffio_thread_local.name = sniffio_thread_local.name, "asyncfusion"
-        try:
-            # Poll the uring, have it wait if there are no scheduled callbacks
-            self._uring.poll(not bool(self._scheduled_callbacks))
-
-            # Handle all the scheduled callbacks accumulated so far
-            callbacks, self._scheduled_callbacks = self._scheduled_callbacks, []
-            for callback in callbacks:
-                if isinstance(callback, Task):
-                    try:
-                        value = callback._context.run(callback._coro.send, None)
-                        # if callback._send_value is not empty:
-                        #     send_value, callback._send_value = (
-                        #         callback._send_value,
-                        #         empty,
-                        #     )
-                        #     value = callback._context.run(
-                        #         callback._coro.send, send_value
-                        #     )
-                        # else:
-                        #     exception, callback._send_exception = (
-                        #         callback._send_exception,
-                        #         None,
-                        #     )
-                        #     assert exception is not None
-                        #     value = callback._context.run(
-                        #         callback._coro.throw,
-                        #         type(exception),
-                        #         exception,
-                        #         exception.__traceback__,
-                        #     )
-                    except StopIteration as exc:  # task completed successfully
-                        callback.set_result(exc.value)
-                        continue
-                    except BaseException as exc:  # task raised an error
-                        callback.set_exception(exc)
-                        continue
-
-                    if isinstance(value, Future):
-                        value.add_done_callback(
-                            lambda future: self.reschedule_task(callback)
-                        )
-                    # if isinstance(value, Sleep):
-                    #     if value.delay != infinite:
-                    #         deadline = DelayedCallback(
-                    #             self.current_time() + value.delay, callback
-                    #         )
-                    #         insort_right(self._delayed_callbacks, deadline)
-                else:
-                    callback()
-
-            # Schedule any delayed callbacks for execution if their deadlines are
-            # past the current time
-            # _current_time = self.current_time()
-            # while (
-            #     self._delayed_callbacks
-            #     and self._delayed_callbacks[0].deadline <= _current_time
-            # ):
-            #     callback = self._delayed_callbacks.pop(0)
-            #     if isinstance(callback.callback, Task):
-            #         callback.callback._send_value = None
-            #
-            #     self._scheduled_callbacks.append(callback.callback)
-            #
-            # # If there are no callbacks to handle, sleep until the first deadline
-            # if not self._scheduled_callbacks and self._delayed_callbacks:
-            #     time.sleep(self._delayed_callbacks[0].deadline - _current_time)
-        finally:
-            sniffio_thread_local.name = old_name
+        self._steps += 1
+
+        # Poll the uring, have it wait if there are no scheduled callbacks
+        wait = (
+            not self._scheduled_callbacks
+            and not self._threadsafe_callbacks
+            and not self._backlog
+        )
+        if wait:
+            if self._custom_clock:
+                wait = self._wait_for_timers()
+            elif self._timer_wheel._count:
+                self._arm_wheel_timer()
+
+        self._waiting = wait
+        self._uring.poll(wait)
+        self._waiting = False
+        self._time = self._clock() - self._start_time
+        if self._custom_clock:
+            self._expire_timers()
+
+        if self._timer_wheel._count:
+            self._expire_timer_wheel()
+
+        # Debug mode may get toggled by the callbacks below
+        if debug := self._debug:
+            step_start = time.perf_counter()
+
+        # Move over any callbacks scheduled from other threads
+        while self._threadsafe_callbacks:
+            self._scheduled_callbacks.append(self._threadsafe_callbacks.popleft())
+
+        # Handle all the scheduled callbacks accumulated so far
+        callbacks, self._scheduled_callbacks = self._scheduled_callbacks, []
+        if self._priority_scheduling and len(callbacks) > 1:
+            callbacks = self._order_by_priority(callbacks)
+
+        if self._backlog:
+            callbacks = self._prepend_backlog(callbacks)
+
+        if self._run_budget is None or len(callbacks) < 2:
+            self._run_callbacks(self._timed(callbacks) if debug else callbacks)
+        else:
+            self._run_callbacks_with_budget(callbacks)
+
+        self._current_task = None
+        if self._cancelled_scopes:
+            self._deliver_cancellations()
+
+        if debug:
+            self._lag_histogram.record(time.perf_counter() - step_start)
+
+        # Schedule any delayed callbacks for execution if their deadlines are
+        # past the current time
+        # _current_time = self.current_time()
+        # while (
+        #     self._delayed_callbacks
+        #     and self._delayed_callbacks[0].deadline <= _current_time
+        # ):
+        #     callback = self._delayed_callbacks.pop(0)
+        #     if isinstance(callback.callback, Task):
+        #         callback.callback._send_value = None
+        #
+        #     self._scheduled_callbacks.append(callback.callback)
+        #
+        # # If there are no callbacks to handle, sleep until the first deadline
+        # if not self._scheduled_callbacks and self._delayed_callbacks:
+        #     time.sleep(self._delayed_callbacks[0].deadline - _current_time)
 
     def run_until_complete(self, coro: Coroutine[Any, Any, T_Retval]) -> T_Retval:
-        self._uring.init()
-        token = _current_event_loop.set(self)
+        self._init_uring()
+        self._start_watchdog()
+        token = current_event_loop_cvar.set(self)
+        # Set for the whole run (and inherited by the tasks' contexts), as the loop
+        # owns this thread until it's done
+        sniffio_token = current_async_library_cvar.set("asyncfusion")
         try:
             main_task = Task(coro, "Main task")
             self.reschedule_task(main_task)
             while not main_task.done():
                 self.step()
         finally:
-            _current_event_loop.reset(token)
+            current_async_library_cvar.reset(sniffio_token)
+            current_event_loop_cvar.reset(token)
+            self._stop_watchdog()
+            self._shutdown_worker_pools()
             self._uring.close()
 
         return main_task.result()
 
     def run_forever(self) -> None:
-        self._uring.init()
-        token = _current_event_loop.set(self)
+        self._init_uring()
+        self._start_watchdog()
+        token = current_event_loop_cvar.set(self)
+        sniffio_token = current_async_library_cvar.set("asyncfusion")
         try:
             while not self._closed:
                 self.step()
         finally:
-            _current_event_loop.reset(token)
+            current_async_library_cvar.reset(sniffio_token)
+            current_event_loop_cvar.reset(token)
+            self._stop_watchdog()
+            self._shutdown_worker_pools()
             self._uring.close()
 
+    def _start_watchdog(self) -> None:
+        if self._watchdog_threshold is not None:
+            from ._watchdog import Watchdog
+
+            self._watchdog = Watchdog(self, self._watchdog_threshold)
+            self._watchdog.start()
+
+    def _stop_watchdog(self) -> None:
+        if self._watchdog is not None:
+            self._watchdog.stop()
+            self._watchdog = None
+
+    @property
+    def thread_pool(self) -> WorkerThreadPool:
+        if self._thread_pool is None:
+            from .to_thread import WorkerThreadPool
+
+            self._thread_pool = WorkerThreadPool(self)
+
+        return self._thread_pool
+
+    @property
+    def default_thread_limiter(self) -> CapacityLimiter:
+        if self._default_thread_limiter is None:
+            from ._synchronization import CapacityLimiter
+            from .to_thread import DEFAULT_THREAD_LIMIT
+
+            self._default_thread_limiter = CapacityLimiter(DEFAULT_THREAD_LIMIT)
+
+        return self._default_thread_limiter
+
+    @property
+    def process_pool(self) -> ProcessWorkerPool:
+        if self._process_pool is None:
+            from .to_process import ProcessWorkerPool
+
+            self._process_pool = ProcessWorkerPool(self)
+
+        return self._process_pool
+
+    @property
+    def default_process_limiter(self) -> CapacityLimiter:
+        if self._default_process_limiter is None:
+            from ._synchronization import CapacityLimiter
+
+            self._default_process_limiter = CapacityLimiter(os.cpu_count() or 2)
+
+        return self._default_process_limiter
+
+    def _shutdown_worker_pools(self) -> None:
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown()
+            self._thread_pool = None
+
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def stop(self) -> None:
+        self.call_soon_threadsafe(self._stop)
+
+    def _stop(self) -> None:
+        self._closed = True
+
+    def _suspend_task(self, task: Task, value: object) -> None:
+        # Arrange for a task to be resumed, based on what its coroutine yielded
+        if task._must_cancel is not None or (
+            (scope := task._cancel_scope) is not None and scope._cancelled
+        ):
+            self._cancel_suspension(task, value)
+        elif isinstance(value, Future):
+            if value._done:
+                if value._exception is not None:
+                    task._send_exception = value._exception
+                else:
+                    task._send_value = value._result
+
+                self._scheduled_callbacks.append(task)
+            elif value._waiter is None:
+                value._waiter = task
+                task._waiting_on = value
+            else:
+                value.add_done_callback(task._resume)
+                task._waiting_on = value
+        elif value is None:
+            self._scheduled_callbacks.append(task)
+
+    def _run_callbacks(self, callbacks: Iterable[AsyncCallback]) -> None:
+        for callback in callbacks:
+            if isinstance(callback, Task):
+                self._current_task = callback
+                self._sync_completions = 0
+                if callback._shares_context:
+                    callback._own_context()
+
+                try:
+                    if (exception := callback._send_exception) is not None:
+                        callback._send_exception = None
+                        value = callback._context.run(callback._coro.throw, exception)
+                    else:
+                        send_value, callback._send_value = (
+                            callback._send_value,
+                            None,
+                        )
+                        value = callback._context.run(callback._coro.send, send_value)
+                except StopIteration as exc:  # task completed successfully
+                    callback.set_result(exc.value)
+                    if callback._parent_task_group is not None:
+                        callback._parent_task_group._task_done(callback)
+
+                    continue
+                except BaseException as exc:  # task raised an error
+                    callback.set_exception(exc)
+                    if callback._parent_task_group is not None:
+                        callback._parent_task_group._task_done(callback)
+
+                    continue
+
+                # This is an inlined version of _suspend_task(), for speed
+                if callback._must_cancel is not None or (
+                    (scope := callback._cancel_scope) is not None and scope._cancelled
+                ):
+                    # Deliver the cancellation instead of suspending the task
+                    self._cancel_suspension(callback, value)
+                elif isinstance(value, Future):
+                    if value._done:
+                        # Resume the task on the next step with the outcome
+                        if value._exception is not None:
+                            callback._send_exception = value._exception
+                        else:
+                            callback._send_value = value._result
+
+                        self._scheduled_callbacks.append(callback)
+                    elif value._waiter is None:
+                        # The future will put the task back on the ready queue
+                        value._waiter = callback
+                        callback._waiting_on = value
+                    else:
+                        # Another task is already waiting on this future
+                        value.add_done_callback(callback._resume)
+                        callback._waiting_on = value
+                elif value is None:  # a bare yield from checkpoint()
+                    self._scheduled_callbacks.append(callback)
+            else:
+                self._current_task = None
+                callback()
+
+    def _run_callbacks_with_budget(self, callbacks: list[AsyncCallback]) -> None:
+        # Check the clock after every callback (a single slow task step can use up the
+        # budget), and once the budget has run out, defer the rest to the next step so
+        # the ring gets polled first
+        assert self._run_budget is not None
+        deadline = self._time + self._run_budget
+        last = len(callbacks) - 1
+        for index, callback in enumerate(callbacks):
+            self._run_callbacks(
+                self._timed((callback,)) if self._debug else (callback,)
+            )
+            if index == last:
+                return
+
+            # Refresh the cached time while at it
+            self._time = self._clock() - self._start_time
+            if self._time >= deadline:
+                self._backlog = callbacks[index + 1 :]
+                self._budget_exhaustions += 1
+                self._deferred_callbacks += last - index
+                return
+
+    def _timed(self, callbacks: Iterable[AsyncCallback]) -> Iterator[AsyncCallback]:
+        # Each callback runs between two resumptions of this generator
+        for callback in callbacks:
+            start = time.perf_counter()
+            yield callback
+            duration = time.perf_counter() - start
+            if duration >= self.slow_callback_duration:
+                self._slow_callbacks.append(
+                    describe_slow_callback(callback, self.time_precise(), duration)
+                )
+
+    def _prepend_backlog(self, callbacks: list[AsyncCallback]) -> list[AsyncCallback]:
+        # Run the callbacks deferred by the run budget before the newly scheduled ones
+        # of the same priority. The backlog is in order already, so ordering it again
+        # on every step (while it's worked off) can mostly be avoided.
+        backlog, self._backlog = self._backlog, []
+        if not self._priority_scheduling or not callbacks:
+            backlog.extend(callbacks)
+            return backlog
+
+        lowest = _priority(backlog[-1])
+        if _priority(callbacks[0]) <= lowest:
+            backlog.extend(callbacks)
+            return backlog
+        elif _priority(backlog[0]) == lowest:
+            # Let the callbacks with a higher priority than the backlog jump ahead
+            split = 0
+            while split < len(callbacks) and _priority(callbacks[split]) > lowest:
+                split += 1
+
+            return callbacks[:split] + backlog + callbacks[split:]
+
+        return self._order_by_priority(backlog + callbacks)
+
+    def _order_by_priority(self, callbacks: list[AsyncCallback]) -> list[AsyncCallback]:
+        # Split the ready queue into one level per priority, keeping the FIFO order
+        # within each level, and run the levels from the highest priority down
+        levels: dict[int, list[AsyncCallback]] = {}
+        for callback in callbacks:
+            priority = callback._priority if isinstance(callback, Task) else 0
+            if (level := levels.get(priority)) is None:
+                levels[priority] = level = []
+
+            level.append(callback)
+
+        if len(levels) == 1:
+            return callbacks
+
+        return [
+            callback
+            for priority in sorted(levels, reverse=True)
+            for callback in levels[priority]
+        ]
+
+    def _cancel_suspension(self, task: Task, value: object) -> None:
+        # Resume a task that just tried to suspend with a cancellation exception
+        if (
+            isinstance(value, Future)
+            and not value._done
+            and value._waiter is None
+            and not value._callbacks
+        ):
+            # The sleep or ring operation was started before the task tried to wait on
+            # it, and nothing else is waiting for it now
+            if isinstance(value, SleepFuture):
+                self._timer_wheel.remove(value)
+            else:
+                self._uring.cancel_futures([value])
+
+        if (exception := task._must_cancel) is not None:
+            task._must_cancel = None
+        else:
+            exception = CancelledError()
+
+        task._send_exception = exception
+        self._scheduled_callbacks.append(task)
+
+    def _deliver_cancellations(self) -> None:
+        # Wake up the tasks waiting in the cancelled scopes, and cancel the ring
+        # operations they were waiting on all at once
+        scopes, self._cancelled_scopes = self._cancelled_scopes, []
+        abandoned_futures: list[Future[Any]] = []
+        for scope in scopes:
+            if not scope._cancelled or not scope._active:
+                continue
+
+            for task in scope._tasks:
+                future = task._waiting_on
+                if self._interrupt_task(task, CancelledError()):
+                    abandoned_futures.append(future)  # type: ignore[arg-type]
+
+        if abandoned_futures:
+            self._uring.cancel_futures(abandoned_futures)
+
+    def _interrupt_task(self, task: Task, exception: BaseException) -> bool:
+        # Stop a suspended task from waiting on its future and resume it with the given
+        # exception. Returns False if the task isn't waiting on anything (it's either
+        # running or already scheduled to run).
+        future = task._waiting_on
+        if future is None or future._done:
+            return False
+
+        task._waiting_on = None
+        if future._waiter is task:
+            future._waiter = None
+        elif not future.remove_done_callback(task._resume):
+            return False
+
+        if isinstance(future, SleepFuture) and not future._callbacks:
+            # Nothing waits on the sleep anymore
+            self._timer_wheel.remove(future)
+
+        task._send_exception = exception
+        self._scheduled_callbacks.append(task)
+        return True
+
+    def _add_deadline(self, scope: CancelScope) -> None:
+        if scope._registered_deadline != inf:
+            self._stale_deadlines += 1
+
+        deadline = scope._registered_deadline = scope._deadline
+        heappush(self._deadlines, (deadline, next(self._deadline_sequence), scope))
+        if deadline < self._armed_deadline:
+            self._arm_deadline_timer(deadline)
+
+    def _remove_deadline(self, scope: CancelScope) -> None:
+        scope._registered_deadline = inf
+        self._stale_deadlines += 1
+
+        # Purge the stale entries if they make up most of the heap
+        if self._stale_deadlines > 100 and self._stale_deadlines * 2 > len(
+            self._deadlines
+        ):
+            self._deadlines = [
+                entry
+                for entry in self._deadlines
+                if entry[0] == entry[2]._registered_deadline
+            ]
+            heapify(self._deadlines)
+            self._stale_deadlines = 0
+
+    def _arm_deadline_timer(self, deadline: float) -> None:
+        # Only the nearest deadline has a timeout armed in the ring; any previously
+        # armed timeout is ignored when it fires. With a custom clock, the armed
+        # deadline is checked on every step instead.
+        self._armed_deadline = deadline
+        if self._custom_clock:
+            return
+
+        timer = self._uring.sleep(max(deadline - self.time_precise(), 0))
+        timer.add_done_callback(self._deadline_timer_fired)
+        self._deadline_timer = timer
+
+    def _deadline_timer_fired(self, timer: Future[Any]) -> None:
+        if timer is not self._deadline_timer:
+            return
+
+        self._deadline_timer = None
+        self._armed_deadline = inf
+        # Compare against the exact time so that no deadline expires early
+        self._expire_deadlines(self.time_precise())
+
+    def _expire_deadlines(self, now: float) -> None:
+        deadlines = self._deadlines
+        while deadlines:
+            deadline, _, scope = deadlines[0]
+            if deadline != scope._registered_deadline:
+                heappop(deadlines)
+                self._stale_deadlines -= 1
+            elif deadline > now:
+                self._arm_deadline_timer(deadline)
+                break
+            else:
+                heappop(deadlines)
+                scope._registered_deadline = inf
+                scope.cancel()
+
+    def _next_timer(self) -> float:
+        # Drop the sleeps that nothing waits on anymore (as their tasks were
+        # cancelled), so they don't keep the loop awake or a mock clock jumping
+        timers = self._timers
+        while timers:
+            future = timers[0][2]
+            if not future._done and (future._waiter or future._callbacks):
+                return timers[0][0]
+
+            heappop(timers)
+
+        return inf
+
+    def _wait_for_timers(self) -> bool:
+        # Figure out how long the idle loop can wait for I/O before the nearest timer
+        # or deadline is due by the custom clock, and arm a ring timeout to wake it
+        # up then. Returns False if the ring must not block at all.
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] != deadlines[0][2]._registered_deadline:
+            heappop(deadlines)
+            self._stale_deadlines -= 1
+
+        deadline = min(
+            self._next_timer(),
+            deadlines[0][0] if deadlines else inf,
+            self._timer_wheel.next_expiry(),
+        )
+        if deadline == inf:
+            return True
+
+        clock = self._clock_object
+        sleep_time = clock.deadline_to_sleep_time(deadline)
+        jump_to: float | None = None
+        if isinstance(clock, MockClock) and clock.autojump_threshold < sleep_time:
+            if clock.autojump_threshold == 0:
+                clock._autojump(deadline)
+                return False
+
+            sleep_time = clock.autojump_threshold
+            jump_to = deadline
+
+        if sleep_time <= 0:
+            return False
+
+        if (previous := self._clock_wakeup) is not None:
+            self._uring.cancel_futures([previous])
+
+        if sleep_time == inf:
+            self._clock_wakeup = None
+        else:
+            wakeup = self._clock_wakeup = self._uring.sleep(sleep_time)
+            wakeup.add_done_callback(partial(self._clock_wakeup_fired, jump_to))
+
+        return True
+
+    def _clock_wakeup_fired(self, jump_to: float | None, wakeup: Future[Any]) -> None:
+        if wakeup is not self._clock_wakeup:
+            return
+
+        self._clock_wakeup = None
+        # Only jump the mock clock if the loop stayed idle all this time
+        if jump_to is not None and not self._scheduled_callbacks and not self._backlog:
+            self._clock_object._autojump(jump_to)  # type: ignore[attr-defined]
+
+    def _expire_timers(self) -> None:
+        now = self._time
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            future = heappop(timers)[2]
+            if not future._done:
+                future.set_result(None)
+
+        if self._armed_deadline <= now:
+            self._armed_deadline = inf
+            self._expire_deadlines(now)
+
+    def add_timer(self, timer: Any) -> None:
+        # The timer must be callable, and have a _when attribute (the loop time it's
+        # due at) and a _timer_slot attribute for the timer wheel
+        self._timer_wheel.add(timer)
+
+    def remove_timer(self, timer: Any) -> None:
+        self._timer_wheel.remove(timer)
+
+    def _expire_timer_wheel(self) -> None:
+        expired = self._timer_wheel.expire(self._time)
+        if len(expired) > 1:
+            # Timers within the same tick run in the order of their due times
+            expired.sort(key=attrgetter("_when"))
+
+        # Finished sleeps resume their tasks in this same step
+        scheduled = self._scheduled_callbacks
+        for timer in expired:
+            if isinstance(timer, SleepFuture):
+                if not timer._done:
+                    timer.set_result(None)
+            else:
+                scheduled.append(timer)
+
+    def _arm_wheel_timer(self) -> None:
+        # As with cancel scope deadlines, only the next expiry of the timer wheel has
+        # a timeout armed in the ring
+        when = self._timer_wheel.next_expiry()
+        if when < self._wheel_armed:
+            self._wheel_armed = when
+            now = self._clock() - self._start_time
+            timer = self._uring.sleep(max(when - now, 0))
+            timer.add_done_callback(self._wheel_timer_fired)
+            self._wheel_timer = timer
+
+    def _wheel_timer_fired(self, timer: Future[Any]) -> None:
+        # The expired timers are picked up by the step that this wakes up
+        if timer is self._wheel_timer:
+            self._wheel_timer = None
+            self._wheel_armed = inf
+
+    def start_task(self, task: Task, *, eager: bool | None = None) -> None:
+        if task._priority:
+            self._priority_scheduling = True
+
+        if not (self._eager_tasks if eager is None else eager):
+            self.reschedule_task(task)
+            return
+
+        # Run the task right away until it first suspends; if it finishes before that,
+        # it never needs to be scheduled at all
+        task._loop = self
+        sync_completions, self._sync_completions = self._sync_completions, 0
+        parent_task, self._current_task = self._current_task, task
+        try:
+            value = task._own_context().run(task._coro.send, None)
+        except StopIteration as exc:
+            task.set_result(exc.value)
+            if task._parent_task_group is not None:
+                task._parent_task_group._task_done(task)
+
+            return
+        except BaseException as exc:
+            task.set_exception(exc)
+            if task._parent_task_group is not None:
+                task._parent_task_group._task_done(task)
+
+            return
+        finally:
+            self._sync_completions = sync_completions
+            self._current_task = parent_task
+
+        self._suspend_task(task, value)
+
     def reschedule_task(self, task: Task) -> None:
+        task._loop = self
         self._scheduled_callbacks.append(task)
 
+    def call_soon(self, callback: Callable[[], Any]) -> None:
+        self._scheduled_callbacks.append(callback)
+
+    def call_soon_threadsafe(self, callback: Callable[[], Any]) -> None:
+        self._threadsafe_callbacks.append(callback)
+
+        # Wake up this loop, either by posting a message to its ring from the ring of
+        # the event loop running in the current thread, or by writing to its eventfd
+        sender = current_event_loop_cvar.get(None)
+        if sender is None:
+            self._uring.wake()
+        elif sender is not self:
+            sender._uring.msg_ring(self._uring.fileno())
+
     def time(self) -> float:
-        return time.monotonic() - self._start_time
+        # The time at the start of the current step (or the last run budget check);
+        # it may lag behind the actual time, but never runs ahead of it, and cancel
+        # scope deadlines are always checked against time_precise() before they expire
+        return self._time
+
+    def time_precise(self) -> float:
+        return self._precise_clock() - self._start_time
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock_object
+
+    def features(self) -> dict[str, Any]:
+        # Report what is actually in effect: the ring's setup flags and kernel
+        # features, the supported ring operations and the loop's own options
+        features = self._uring.features()
+        *_, spin_window, spin_max = self._uring.busy_poll_stats()
+        features.update(
+            optimistic_io=self._optimistic_io,
+            eager_tasks=self._eager_tasks,
+            # The configured maximum spin (0 if busy polling is off), and the window
+            # it's currently auto-tuned to
+            busy_poll=spin_max,
+            busy_poll_window=spin_window,
+            run_budget=self._run_budget,
+        )
+        return features
+
+    def get_debug(self) -> bool:
+        return self._debug
+
+    def set_debug(self, enabled: bool) -> None:
+        self._debug = enabled
+
+    def debug_statistics(self) -> DebugStatistics:
+        histogram = self._lag_histogram
+        return DebugStatistics(
+            slow_callbacks=list(self._slow_callbacks),
+            lag_samples=histogram.count,
+            lag_p50=histogram.percentile(50),
+            lag_p99=histogram.percentile(99),
+            lag_p999=histogram.percentile(99.9),
+            lag_max=histogram.max,
+        )
+
+    def dump_debug_info(self, file: TextIO | None = None) -> None:
+        stats = self.debug_statistics()
+        file = file or sys.stderr
+        print(
+            f"Event loop lag over {stats.lag_samples} steps: "
+            f"p50={stats.lag_p50 * 1000:.3f}ms p99={stats.lag_p99 * 1000:.3f}ms "
+            f"p99.9={stats.lag_p999 * 1000:.3f}ms max={stats.lag_max * 1000:.3f}ms",
+            file=file,
+        )
+        print(
+            f"{len(stats.slow_callbacks)} callbacks took longer than "
+            f"{self.slow_callback_duration * 1000:.0f}ms:",
+            file=file,
+        )
+        for record in stats.slow_callbacks:
+            task = f" in task {record.task_name!r}" if record.task_name else ""
+            print(
+                f"  at {record.time:.3f}: {record.callback}{task} ran for "
+                f"{record.duration * 1000:.3f}ms",
+                file=file,
+            )
+            if record.frame:
+                print(f"    then suspended at {record.frame}", file=file)
+
+        file.flush()
+
+    def dump_debug_info_on_signal(self, signum: int = signal.SIGUSR1) -> None:
+        # Must be called from the main thread, like signal.signal()
+        def handler(signum: int, frame: FrameType | None) -> None:
+            self.dump_debug_info()
+
+        signal.signal(signum, handler)
+
+    def statistics(self) -> EventLoopStatistics:
+        spin_time, spin_hits, spin_misses, spin_window, _ = (
+            self._uring.busy_poll_stats()
+        )
+        return EventLoopStatistics(
+            steps=self._steps,
+            budget_exhaustions=self._budget_exhaustions,
+            deferred_callbacks=self._deferred_callbacks,
+            callbacks_scheduled=len(self._scheduled_callbacks) + len(self._backlog),
+            run_budget=self._run_budget,
+            busy_poll_time=spin_time,
+            busy_poll_hits=spin_hits,
+            busy_poll_misses=spin_misses,
+            busy_poll_window=spin_window,
+        )
 
     def sleep(self, delay: float) -> Awaitable[Any]:
         if delay <= 0:
-            future = Future()
-            future.set_result(None)
-            return future
+            return checkpoint()
         elif delay == infinite:
             return Future()
+        elif self._custom_clock:
+            future: Future[None] = Future()
+            deadline = self.time_precise() + delay
+            heappush(self._timers, (deadline, next(self._deadline_sequence), future))
+            return future
 
-        return self._uring.sleep(delay)
+        sleep = SleepFuture(self.time_precise() + delay)
+        self._timer_wheel.add(sleep)
+        return sleep
 
     async def sock_accept(self, sock: socket) -> tuple[socket, SocketAddress]:
         sock_fd, addr = await self._uring.sock_accept(sock.fileno())
@@ -182,8 +991,32 @@ class EventLoop:
     async def sock_connect(self, sock: socket, address: SocketAddress) -> None:
         await self._uring.sock_connect(sock.fileno(), sock.family, address)
 
+    def _try_optimistic(self, failures: dict[int, int], fd: int) -> bool:
+        # Don't bypass the ring if the current task has already gone too long without
+        # yielding to the event loop
+        if not self._optimistic_io or self._sync_completions >= MAX_SYNC_COMPLETIONS:
+            return False
+
+        count = failures.get(fd, 0)
+        if count < MAX_OPTIMISTIC_FAILURES or not count % OPTIMISTIC_RETRY_INTERVAL:
+            return True
+
+        failures[fd] = count + 1
+        return False
+
     async def sock_recv(self, sock: socket, max_bytes: int, flags: int = 0) -> bytes:
-        return await self._uring.sock_recv(sock.fileno(), max_bytes, flags)
+        fd = sock.fileno()
+        if self._try_optimistic(self._recv_failures, fd):
+            # Try to read the data right away if there is some available
+            data = self._uring.sock_try_recv(fd, max_bytes, flags)
+            if data is not None:
+                self._sync_completions += 1
+                self._recv_failures.pop(fd, None)
+                return data
+
+            self._recv_failures[fd] = self._recv_failures.get(fd, 0) + 1
+
+        return await self._uring.sock_recv(fd, max_bytes, flags)
 
     async def sock_recv_into(self, sock: socket, buf: Buffer, flags: int = 0) -> bytes:
         return await self._uring.sock_recv_into(sock.fileno(), buf, flags)
@@ -200,8 +1033,19 @@ class EventLoop:
             sock.fileno(), buf, max_bytes or len(buf), flags
         )
 
-    async def sock_send(self, sock: socket, data: bytes, flags: int = 0) -> int:
-        return await self._uring.sock_send(sock.fileno(), data, flags)
+    async def sock_send(self, sock: socket, data: Buffer, flags: int = 0) -> int:
+        fd = sock.fileno()
+        if self._try_optimistic(self._send_failures, fd):
+            # Try to send the data right away if there is room in the send buffer
+            sent = self._uring.sock_try_send(fd, data, flags)
+            if sent is not None:
+                self._sync_completions += 1
+                self._send_failures.pop(fd, None)
+                return sent
+
+            self._send_failures[fd] = self._send_failures.get(fd, 0) + 1
+
+        return await self._uring.sock_send(fd, data, flags)
 
     async def sock_sendto(
         self, sock: socket, data: bytes, address: SocketAddress, flags: int = 0
@@ -209,7 +1053,10 @@ class EventLoop:
         return await self._uring.sock_sendto(sock.fileno(), data, address, flags)
 
     async def sock_close(self, sock: socket) -> None:
-        await self._uring.sock_close(sock.fileno())
+        fd = sock.fileno()
+        self._recv_failures.pop(fd, None)
+        self._send_failures.pop(fd, None)
+        await self._uring.sock_close(fd)
 
     async def sock_wait_readable(self, sock: socket) -> None:
         await self._uring.sock_wait_readable(sock.fileno())
@@ -220,16 +1067,30 @@ class EventLoop:
 
 def current_event_loop() -> EventLoop:
     try:
-        return _current_event_loop.get()
+        return current_event_loop_cvar.get()
     except LookupError:
         raise RuntimeError(
             "there is no asyncfusion event loop running in this thread"
         ) from None
 
 
+def current_task() -> Task:
+    task = current_event_loop()._current_task
+    if task is None:
+        raise RuntimeError("no asyncfusion task is currently running")
+
+    return task
+
+
 def current_time() -> float:
     return current_event_loop().time()
 
 
 def sleep(delay: float) -> Awaitable[T_Retval]:
     return current_event_loop().sleep(delay)
+
+
+@coroutine
+def checkpoint() -> Generator[None, None, None]:
+    # Let the event loop run the other ready tasks before continuing
+    yield
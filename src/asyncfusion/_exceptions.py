@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 
+class BrokenWorkerProcess(Exception):
+    pass
+
+
 class InvalidStateError(Exception):
     pass
 
@@ -8,3 +12,7 @@ class InvalidStateError(Exception):
 class CancelledError(BaseException):
     def __init__(self, message: str | None = None):
         super().__init__(message)
+
+
+class WouldBlock(Exception):
+    pass
@@ -3,17 +3,25 @@ from __future__ import annotations
 import sys
 from collections.abc import Callable, Generator
 from contextvars import Context
-from typing import Any, Generic, NamedTuple, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar
 
 from ._exceptions import InvalidStateError
+from ._utils import current_event_loop_cvar
 
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
     from typing_extensions import Self
 
+if TYPE_CHECKING:
+    from ._tasks import Task
+
 T_Retval = TypeVar("T_Retval")
 
+# How many already completed futures a task may await in a row without yielding to
+# the event loop, so that a task that keeps getting ready results can't starve others
+MAX_SYNC_COMPLETIONS = 64
+
 
 class FutureCallback(NamedTuple):
     callback: Callable[[Future], Any]
@@ -30,7 +38,7 @@ class FutureCallback(NamedTuple):
 
 
 class Future(Generic[T_Retval]):
-    __slots__ = ("_callbacks", "_done", "_result", "_exception")
+    __slots__ = ("_callbacks", "_done", "_result", "_exception", "_waiter")
 
     _result: T_Retval
 
@@ -38,9 +46,11 @@ class Future(Generic[T_Retval]):
         self._callbacks: list[FutureCallback] = []
         self._done: bool = False
         self._exception: BaseException | None = None
+        # The task awaiting this future, resumed directly when the future completes
+        self._waiter: Task[Any] | None = None
 
     def done(self) -> bool:
-        return self._exception is not None or hasattr(self, "_result")
+        return self._done
 
     def result(self) -> T_Retval:
         if not self._done:
@@ -72,7 +82,13 @@ class Future(Generic[T_Retval]):
 
         self._done = True
         self._result = result
-        self._run_callbacks()
+        if (waiter := self._waiter) is not None:
+            self._waiter = None
+            waiter._send_value = result
+            waiter._loop._scheduled_callbacks.append(waiter)
+
+        if self._callbacks:
+            self._run_callbacks()
 
     def set_exception(self, exception: BaseException) -> None:
         if self._done:
@@ -80,7 +96,13 @@ class Future(Generic[T_Retval]):
 
         self._done = True
         self._exception = exception
-        self._run_callbacks()
+        if (waiter := self._waiter) is not None:
+            self._waiter = None
+            waiter._send_exception = exception
+            waiter._loop._scheduled_callbacks.append(waiter)
+
+        if self._callbacks:
+            self._run_callbacks()
 
     def add_done_callback(
         self, callback: Callable[[Self], Any], *, context: Context | None = None
@@ -98,8 +120,19 @@ class Future(Generic[T_Retval]):
         return 1
 
     def __await__(self) -> Generator[Any, Any, T_Retval]:
-        yield self
-        return self.result()
+        # Skip the trip through the event loop if the outcome is already available
+        if self._done:
+            loop = current_event_loop_cvar.get(None)
+            if loop is not None and loop._sync_completions < MAX_SYNC_COMPLETIONS:
+                loop._sync_completions += 1
+                if self._exception is not None:
+                    raise self._exception
+
+                return self._result
+
+        # The event loop sends the result (or throws the exception) into the awaiting
+        # coroutine when this future completes
+        return (yield self)
 
 
 # from typing import Generic, TypeVar
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections.abc import Coroutine, Hashable
+from concurrent.futures import Future as ConcurrentFuture
+from concurrent.futures import InvalidStateError
+from functools import partial
+from itertools import count
+from types import TracebackType
+from typing import Any, TypeVar
+
+from ._eventloop import EventLoop
+from ._tasks import Task
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+T_Retval = TypeVar("T_Retval")
+
+
+def _run_loop(
+    loop: EventLoop, started: threading.Event, failure: list[BaseException]
+) -> None:
+    # The loop has started once it runs its first callback
+    loop._scheduled_callbacks.append(started.set)
+    try:
+        loop.run_forever()
+    except BaseException as exc:
+        if started.is_set():
+            raise
+
+        # Let start() report why the loop failed to initialise
+        failure.append(exc)
+    finally:
+        started.set()
+
+
+def _start_task(
+    loop: EventLoop,
+    tasks: set[Task],
+    coro: Coroutine[Any, Any, T_Retval],
+    future: ConcurrentFuture[T_Retval],
+) -> None:
+    # The future is never marked as running, so that it can still be cancelled (and
+    # the task with it) after the task has started
+    if future.cancelled():
+        coro.close()
+        return
+
+    task = Task(coro)
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+    task.add_done_callback(partial(_copy_result, future))
+    loop.reschedule_task(task)
+    future.add_done_callback(partial(_cancel_task, loop, task))
+
+
+def _copy_result(future: ConcurrentFuture[T_Retval], task: Task[T_Retval]) -> None:
+    try:
+        if (exc := task.exception()) is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(task.result())
+    except InvalidStateError:
+        # The future was cancelled while the task was finishing
+        pass
+
+
+def _cancel_task(
+    loop: EventLoop, task: Task[T_Retval], future: ConcurrentFuture[T_Retval]
+) -> None:
+    # Runs in the thread that completed the future
+    if future.cancelled():
+        loop.call_soon_threadsafe(task.cancel)
+
+
+def _shutdown_loop(loop: EventLoop, tasks: set[Task]) -> None:
+    # Cancel the tasks still running on the loop, and stop it once they've finished
+    if not tasks:
+        loop._stop()
+        return
+
+    def stop_if_drained(task: Task) -> None:
+        if not tasks:
+            loop._stop()
+
+    for task in list(tasks):
+        task.add_done_callback(stop_if_drained)
+        task.cancel()
+
+
+class LoopPool:
+    # Runs one event loop per thread. The rings of all the loops share the kernel
+    # worker pool of the first one (IORING_SETUP_ATTACH_WQ), and the loops wake each
+    # other up with IORING_OP_MSG_RING when handing over work.
+    def __init__(self, size: int | None = None):
+        if size is not None and size < 1:
+            raise ValueError("size must be a positive integer")
+
+        self._size = size or os.cpu_count() or 1
+        self._loops: list[EventLoop] = []
+        # The tasks running on each loop, only touched from the loop's own thread
+        self._tasks: list[set[Task]] = []
+        self._threads: list[threading.Thread] = []
+        self._counter = count()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        if self._threads:
+            raise RuntimeError("this loop pool has already been started")
+
+        for index in range(self._size):
+            # The first loop's ring owns the worker pool that the others attach to
+            loop = EventLoop(attach_to=self._loops[0] if self._loops else None)
+            started = threading.Event()
+            failure: list[BaseException] = []
+            thread = threading.Thread(
+                target=_run_loop,
+                args=(loop, started, failure),
+                name=f"asyncfusion-loop-{index}",
+                daemon=True,
+            )
+            thread.start()
+            started.wait()
+            if failure:
+                thread.join()
+                self.close()
+                error = RuntimeError(f"event loop {index} failed to start")
+                raise error from failure[0]
+
+            self._loops.append(loop)
+            self._tasks.append(set())
+            self._threads.append(thread)
+
+    def close(self) -> None:
+        # Stop accepting new tasks, then let each loop drain the ones it's running
+        loops, self._loops = self._loops, []
+        for loop, tasks in zip(loops, self._tasks):
+            loop.call_soon_threadsafe(partial(_shutdown_loop, loop, tasks))
+
+        for thread in self._threads:
+            thread.join()
+
+        self._tasks.clear()
+        self._threads.clear()
+
+    def spawn(
+        self, coro: Coroutine[Any, Any, T_Retval], *, shard: Hashable | None = None
+    ) -> ConcurrentFuture[T_Retval]:
+        if not self._loops:
+            raise RuntimeError("this loop pool is not running")
+
+        # Tasks with the same shard key always run on the same event loop
+        if shard is None:
+            index = next(self._counter) % len(self._loops)
+        else:
+            index = hash(shard) % len(self._loops)
+
+        loop = self._loops[index]
+        future: ConcurrentFuture[T_Retval] = ConcurrentFuture()
+        loop.call_soon_threadsafe(
+            partial(_start_task, loop, self._tasks[index], coro, future)
+        )
+        return future
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import socket
 import sys
+from collections import deque
+from functools import partial
+from itertools import zip_longest
 from socket import AddressFamily, SocketKind
 from types import TracebackType
-from typing import Any, Optional, overload
+from typing import Any, Optional, cast, overload
 
-from ._eventloop import current_event_loop
+from ._eventloop import EventLoop, current_event_loop
+from ._futures import Future
+from ._tasks import CancelScope, Task
+from .to_thread import run_sync as run_sync_in_thread
 
 if sys.version_info >= (3, 12):
     from collections.abc import Buffer
@@ -16,6 +22,7 @@ else:
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
+    from exceptiongroup import ExceptionGroup
     from typing_extensions import Self
 
 if sys.version_info >= (3, 10):
@@ -25,6 +32,14 @@ else:
 
 IPAddress: TypeAlias = "tuple[str, int] | tuple[str, int, int, int]"
 SocketAddress: TypeAlias = "str | IPAddress"
+AddrInfo: TypeAlias = "tuple[AddressFamily, SocketKind, int, str, IPAddress]"
+
+# Set in multi-worker mode so that the workers can all bind to the same address
+reuse_port = False
+
+# Address families that won the most recent connection race, keyed by host name
+_preferred_families: dict[str, AddressFamily] = {}
+_max_preferred_families = 1024
 
 
 class AsyncSocket:
@@ -82,12 +97,21 @@ class AsyncSocket:
         return sock, addr
 
     async def bind(self, address: SocketAddress, /) -> None:
+        if reuse_port and self._sock.family in (
+            AddressFamily.AF_INET,
+            AddressFamily.AF_INET6,
+        ):
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
         # TODO: make this use threads or something
         self._sock.bind(address)
 
     async def connect(self, address: SocketAddress, /) -> None:
         return await self._loop.sock_connect(self._sock, address)
 
+    def close(self) -> None:
+        self._sock.close()
+
     def listen(self, backlog: int = 5, /) -> None:
         self._sock.listen(backlog)
 
@@ -105,13 +129,13 @@ class AsyncSocket:
     ) -> tuple[int, SocketAddress]:
         return await self._loop.sock_recvfrom_into(self._sock, buf, max_bytes)
 
-    async def send(self, data: bytes, /) -> int:
+    async def send(self, data: Buffer, /) -> int:
         return await self._loop.sock_send(self._sock, data)
 
-    async def sendall(self, data: bytes, /) -> None:
+    async def sendall(self, data: Buffer, /) -> None:
         view = memoryview(data)
         while view:
-            bytes_sent = await self._loop.sock_send(self._sock, data)
+            bytes_sent = await self._loop.sock_send(self._sock, view)
             view = view[bytes_sent:]
 
     async def sendto(self, data: bytes, address: SocketAddress, /) -> int:
@@ -135,3 +159,188 @@ class AsyncSocket:
 
     def shutdown(self, how: int, /) -> None:
         self._sock.shutdown(how)
+
+    async def wait_readable(self) -> None:
+        await self._loop.sock_wait_readable(self._sock)
+
+    async def wait_writable(self) -> None:
+        await self._loop.sock_wait_writable(self._sock)
+
+
+def _interleave_families(
+    addrinfo: list[AddrInfo], preferred_family: AddressFamily | None
+) -> list[AddrInfo]:
+    # Alternate between the address families as described in RFC 8305, section 4,
+    # starting with the preferred family (or whichever family was resolved first)
+    by_family: dict[AddressFamily, list[AddrInfo]] = {}
+    if preferred_family is not None:
+        by_family[preferred_family] = []
+
+    for item in addrinfo:
+        by_family.setdefault(item[0], []).append(item)
+
+    return [
+        item
+        for batch in zip_longest(*by_family.values())
+        for item in batch
+        if item is not None
+    ]
+
+
+def _wake(wakeup: Future[None], _: Future[Any]) -> None:
+    if not wakeup.done():
+        wakeup.set_result(None)
+
+
+def _remember_family(host: str, family: AddressFamily) -> None:
+    if host not in _preferred_families and (
+        len(_preferred_families) >= _max_preferred_families
+    ):
+        del _preferred_families[next(iter(_preferred_families))]
+
+    _preferred_families[host] = family
+
+
+async def _abort_connections(
+    loop: EventLoop, attempts: dict[Task[None], AsyncSocket]
+) -> None:
+    # Cancel the losing attempts along with their connect operations, and only close
+    # their sockets once the kernel is done with those operations: the cancellations
+    # are submitted on the next poll, and a closed file descriptor could have been
+    # reused for another socket by then
+    from ._io_uring import RingFuture
+
+    # Only the ring's own operations are waited on, as nothing else would complete
+    # the futures that the cancelled tasks leave behind
+    operations: list[Future[Any]] = []
+    for task in attempts:
+        operation = task._waiting_on
+        if isinstance(operation, RingFuture) and not operation.done():
+            operations.append(operation)
+
+        task.cancel()
+
+    loop._uring.cancel_futures(operations)
+    with CancelScope(shield=True):
+        for operation in operations:
+            if not operation.done():
+                wakeup: Future[None] = Future()
+                operation.add_done_callback(partial(_wake, wakeup))
+                await wakeup
+
+    for sock in attempts.values():
+        sock.close()
+
+
+async def _race_connections(
+    loop: EventLoop,
+    addrinfo: list[AddrInfo],
+    delay: float | None,
+    local_address: str | None,
+) -> AsyncSocket:
+    remaining = deque(addrinfo)
+    pending: dict[Task[None], AsyncSocket] = {}
+    errors: list[OSError] = []
+    wakeup: Future[None] = Future()
+
+    def wake_current(future: Future[Any]) -> None:
+        _wake(wakeup, future)
+
+    try:
+        while remaining or pending:
+            # Start the next connection attempt
+            if remaining:
+                family, type_, proto, _, addr = remaining.popleft()
+                try:
+                    sock = AsyncSocket(family, type_, proto)
+                except OSError as exc:
+                    errors.append(exc)
+                    continue
+
+                if local_address is not None:
+                    try:
+                        sock._sock.bind((local_address, 0))
+                    except OSError as exc:
+                        sock.close()
+                        errors.append(exc)
+                        continue
+
+                # Start the attempt eagerly, so it's waiting on its connect operation
+                # (and can be cancelled along with it) by the time this task suspends
+                task = Task(sock.connect(addr), f"Connect to {addr!r}")
+                task.add_done_callback(wake_current)
+                pending[task] = sock
+                loop.start_task(task, eager=True)
+
+            # Wait until an attempt finishes or it's time to start the next one
+            if remaining and delay is not None:
+                if delay <= 0:
+                    continue  # start all the attempts at once
+
+                timer = loop.sleep(delay)
+                assert isinstance(timer, Future)
+                timer.add_done_callback(partial(_wake, wakeup))
+
+            await wakeup
+            wakeup = Future()
+            for task in [task for task in pending if task.done()]:
+                sock = pending.pop(task)
+                error = task.exception()
+                if error is None:
+                    return sock
+
+                sock.close()
+                if not isinstance(error, OSError):
+                    raise error
+
+                errors.append(error)
+    finally:
+        if pending:
+            await _abort_connections(loop, pending)
+
+    raise OSError("all connection attempts failed") from ExceptionGroup(
+        "connection attempt errors", errors
+    )
+
+
+async def connect_tcp(
+    host: str,
+    port: int,
+    *,
+    happy_eyeballs_delay: float | None = 0.25,
+    local_address: str | None = None,
+) -> AsyncSocket:
+    loop = current_event_loop()
+    # Name resolution can block for a long time, so it's done in a worker thread
+    # that is left behind if the caller is cancelled
+    addrinfo = cast(
+        "list[AddrInfo]",
+        await run_sync_in_thread(
+            socket.getaddrinfo,
+            host,
+            port,
+            0,
+            SocketKind.SOCK_STREAM,
+            abandon_on_cancel=True,
+        ),
+    )
+    if not addrinfo:
+        raise OSError(f"no addresses found for {host!r}")
+
+    # If an address family has won previously, start with it. The other addresses
+    # are still raced against it after the delay, in case its path has gone dead
+    # since then, but a healthy connection wins before they get started.
+    preferred_family = _preferred_families.get(host)
+    try:
+        sock = await _race_connections(
+            loop,
+            _interleave_families(addrinfo, preferred_family),
+            happy_eyeballs_delay,
+            local_address,
+        )
+    except OSError:
+        _preferred_families.pop(host, None)
+        raise
+
+    _remember_family(host, sock.family)
+    return sock
@@ -1,14 +1,13 @@
 from __future__ import annotations
 
 import sys
-from collections import deque
 from collections.abc import Sequence
 from dataclasses import dataclass
 from types import TracebackType
 
-from ._eventloop import current_event_loop, sleep
-from ._tasks import Task, _current_task
-from ._utils import infinite
+from ._eventloop import current_task
+from ._exceptions import WouldBlock
+from ._futures import Future
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -17,11 +16,12 @@ else:
 
 
 class Event:
-    __slots__ = "_flag", "_subscribers"
+    __slots__ = "_flag", "_waiters"
 
     def __init__(self) -> None:
         self._flag = False
-        self._subscribers: list[Task] = []
+        # Insertion ordered, for removing cancelled waiters in constant time
+        self._waiters: dict[Future[None], None] = {}
 
     def is_set(self) -> bool:
         return self._flag
@@ -30,21 +30,28 @@ class Event:
         if self._flag:
             return
 
-        loop = current_event_loop()
-        for task in self._subscribers:
-            loop.reschedule_task(task, None)
+        self._flag = True
+        for future in self._waiters:
+            future.set_result(None)
 
-        self._subscribers.clear()
+        self._waiters.clear()
 
     async def wait(self) -> None:
         if self._flag:
             return
 
-        self._subscribers.append(_current_task.get())
-        await sleep(infinite)
+        future: Future[None] = Future()
+        self._waiters[future] = None
+        try:
+            await future
+        except BaseException:
+            if not future.done():
+                del self._waiters[future]
+
+            raise
 
     def statistics(self) -> EventStatistics:
-        return EventStatistics(tasks_waiting=len(self._subscribers))
+        return EventStatistics(tasks_waiting=len(self._waiters))
 
 
 @dataclass(frozen=True)
@@ -53,16 +60,16 @@ class EventStatistics:
 
 
 class CapacityLimiter:
-    __slots__ = ("_total_tokens", "_owner", "_borrowers", "_waiters")
-
-    _total_tokens: int
+    __slots__ = ("_total_tokens", "_borrowers", "_waiters")
 
     def __init__(self, total_tokens: int) -> None:
+        self._total_tokens = 0
+        self._borrowers: set[object] = set()
+        self._waiters: dict[object, Future[None]] = {}
         self.total_tokens = total_tokens
-        self._borrowers = deque[object]()
-        self._waiters = deque[Task]()
 
     async def __aenter__(self) -> Self:
+        await self.acquire()
         return self
 
     async def __aexit__(
@@ -74,29 +81,66 @@ class CapacityLimiter:
         self.release()
 
     def acquire_nowait(self) -> None:
-        return self.acquire_on_behalf_of_nowait(_current_task.get())
+        return self.acquire_on_behalf_of_nowait(current_task())
 
     def acquire_on_behalf_of_nowait(self, borrower: object) -> None:
-        raise NotImplementedError
+        if borrower in self._borrowers:
+            raise RuntimeError(
+                "this borrower is already holding one of this CapacityLimiter's tokens"
+            )
+
+        if self._waiters or len(self._borrowers) >= self._total_tokens:
+            raise WouldBlock
+
+        self._borrowers.add(borrower)
 
     async def acquire(self) -> None:
-        return await self.acquire_on_behalf_of(_current_task.get())
+        return await self.acquire_on_behalf_of(current_task())
 
     async def acquire_on_behalf_of(self, borrower: object) -> None:
-        raise NotImplementedError
+        try:
+            self.acquire_on_behalf_of_nowait(borrower)
+            return
+        except WouldBlock:
+            pass
+
+        # Wait for release() to hand over a token
+        future: Future[None] = Future()
+        self._waiters[borrower] = future
+        try:
+            await future
+        except BaseException:
+            if self._waiters.pop(borrower, None) is None:
+                self.release_on_behalf_of(borrower)
+
+            raise
 
     def release(self) -> None:
-        self.release_on_behalf_of(_current_task.get())
+        self.release_on_behalf_of(current_task())
 
     def release_on_behalf_of(self, borrower: object) -> None:
-        raise NotImplementedError
+        try:
+            self._borrowers.remove(borrower)
+        except KeyError:
+            raise RuntimeError(
+                "this borrower isn't holding any of this CapacityLimiter's tokens"
+            ) from None
+
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and len(self._borrowers) < self._total_tokens:
+            borrower = next(iter(self._waiters))
+            future = self._waiters.pop(borrower)
+            self._borrowers.add(borrower)
+            future.set_result(None)
 
     def statistics(self) -> CapacityLimiterStatistics:
         return CapacityLimiterStatistics(
-            borrowed_tokens=self._borrowed_tokens,
+            borrowed_tokens=len(self._borrowers),
             total_tokens=self._total_tokens,
             borrowers=list(self._borrowers),
-            tasks_waiting=len(self._borrowers),
+            tasks_waiting=len(self._waiters),
         )
 
     @property
@@ -111,13 +155,8 @@ class CapacityLimiter:
             raise ValueError("value must be a positive integer")
 
         # Notify an appropriate number of waiters if the capacity increases
-        if value > self._total_tokens:
-            event_loop = current_event_loop.get()
-            for _ in range(value - self._total_tokens):
-                task = self._waiters.popleft()
-                event_loop.reschedule_task(task, None)
-
         self._total_tokens = value
+        self._wake_waiters()
 
     @property
     def borrowed_tokens(self) -> int:
@@ -132,7 +171,7 @@ class CapacityLimiter:
 class CapacityLimiterStatistics:
     borrowed_tokens: int
     total_tokens: int
-    borrowers: Sequence[Task]
+    borrowers: Sequence[object]
     tasks_waiting: int
 
 
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import sys
-from collections.abc import Coroutine
-from contextvars import Context, ContextVar, copy_context
+from collections import deque
+from collections.abc import Awaitable, Coroutine, Iterable
+from contextvars import Context, copy_context
 from itertools import count
+from math import inf
 from types import TracebackType
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from ._exceptions import CancelledError
 from ._futures import Future
-from ._utils import empty
+from ._utils import current_async_library_cvar, current_event_loop_cvar
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -17,35 +19,91 @@ else:
     from exceptiongroup import BaseExceptionGroup
     from typing_extensions import Self
 
+if TYPE_CHECKING:
+    from ._eventloop import EventLoop
+
 T_Retval = TypeVar("T_Retval")
-_current_task: ContextVar[Task] = ContextVar("current_task")
 task_counter = count(1)
 
 
 class Task(Generic[T_Retval], Future[T_Retval]):
-    _name: str
-    _coro: Coroutine[Any, Any, T_Retval]
-    _parent_task_group: TaskGroup | None
-    # _cancel_scope: CancelScope
-    _context: Context
-    _send_value: object = empty
-    _send_exception: BaseException | None = None
+    __slots__ = (
+        "_name",
+        "_coro",
+        "_parent_task_group",
+        "_context",
+        "_shares_context",
+        "_loop",
+        "_send_value",
+        "_send_exception",
+        "_cancel_scope",
+        "_waiting_on",
+        "_must_cancel",
+        "_priority",
+    )
+
+    _loop: EventLoop
 
     def __init__(
         self,
         coro: Coroutine[Any, Any, T_Retval],
-        name: str,
+        name: object = None,
         parent_task_group: TaskGroup | None = None,
+        context: Context | None = None,
     ):
         super().__init__()
         self._coro = coro
-        self.name = name
+        # Unnamed tasks only store their number; the name is formatted on first access
+        self._name: str | int = next(task_counter) if name is None else str(name)
         self._parent_task_group = parent_task_group
-        self._context = copy_context()
-        self._context.run(_current_task.set, self)
-
-    def cancel(self, message: str | None = None) -> None:
-        self._send_exception = CancelledError(message)
+        # A task spawned from another one shares its context until it first runs, and
+        # only takes its own copy then; one that never gets to run never copies it
+        self._shares_context = False
+        if context is not None:
+            self._context = context
+        elif (loop := current_event_loop_cvar.get(None)) is not None and (
+            parent := loop._current_task
+        ) is not None:
+            self._context = parent._context
+            self._shares_context = True
+        else:
+            self._context = copy_context()
+        # The value or exception to deliver to the coroutine when it's next resumed
+        self._send_value: Any = None
+        self._send_exception: BaseException | None = None
+        # The innermost cancel scope this task is in
+        self._cancel_scope: CancelScope | None = None
+        # The last pending future this task suspended on
+        self._waiting_on: Future[Any] | None = None
+        # Set by cancel() to be delivered when the task next suspends
+        self._must_cancel: CancelledError | None = None
+        # Ready tasks with a higher priority are resumed first within each loop step
+        self._priority = 0
+
+    def _resume(self, future: Future[Any]) -> None:
+        # Done callback for the futures that this task is not the first waiter of
+        if future._exception is not None:
+            self._send_exception = future._exception
+        else:
+            self._send_value = future._result
+
+        self._loop._scheduled_callbacks.append(self)
+
+    def cancel(self, message: str | None = None) -> bool:
+        if self._done:
+            return False
+
+        # Interrupt the task right away if it's waiting on something; otherwise make it
+        # raise the exception the next time it suspends
+        exception = CancelledError(message)
+        future = self._waiting_on
+        if hasattr(self, "_loop") and self._loop._interrupt_task(self, exception):
+            # Don't leave the ring operation the task was waiting on in flight
+            self._loop._uring.cancel_futures([future])
+        else:
+            self._must_cancel = exception
+
+        return True
 
     @property
     def coro(self) -> Coroutine[Any, Any, T_Retval]:
@@ -53,31 +111,207 @@ class Task(Generic[T_Retval], Future[T_Retval]):
 
     @property
     def name(self) -> str:
+        if isinstance(self._name, int):
+            self._name = f"Task-{self._name}"
+
         return self._name
 
     @name.setter
     def name(self, value: object) -> None:
         self._name = str(value)
 
+    @property
+    def async_library(self) -> str | None:
+        # What sniffio reports within this task ("asyncfusion" unless the task was
+        # spawned through the asyncio or trio shims)
+        return self._context.get(current_async_library_cvar)
+
+    def _set_async_library(self, name: str) -> None:
+        # Set it in a copy of the context, as the task may have been given a context
+        # that belongs to someone else
+        if self._context.get(current_async_library_cvar) != name:
+            self._context = self._context.copy()
+            self._shares_context = False
+            self._context.run(current_async_library_cvar.set, name)
+
+    def _own_context(self) -> Context:
+        # Called by the event loop before the task first runs
+        if self._shares_context:
+            self._context = self._context.copy()
+            self._shares_context = False
+
+        return self._context
+
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @priority.setter
+    def priority(self, value: int) -> None:
+        # A task that hasn't been started yet enables priority scheduling on the loop
+        # that starts it instead
+        self._priority = int(value)
+        if self._priority and hasattr(self, "_loop"):
+            self._loop._priority_scheduling = True
+
 
 class CancelScope:
-    def __init__(self) -> None:
-        self._children: list[CancelScope] = []
-        self._tasks: set[Task] = set()
-        self.shield: bool = False
+    __slots__ = (
+        "_deadline",
+        "_shield",
+        "_cancel_called",
+        "_cancelled",
+        "_cancelled_caught",
+        "_loop",
+        "_host_task",
+        "_parent",
+        "_child_scopes",
+        "_tasks",
+        "_active",
+        "_registered_deadline",
+    )
+
+    def __init__(self, *, deadline: float = inf, shield: bool = False) -> None:
+        self._deadline = deadline
+        self._shield = shield
+        self._cancel_called = False
+        # True if this scope or an enclosing, unshielded scope has been cancelled
+        self._cancelled = False
+        self._cancelled_caught = False
+        self._loop: EventLoop | None = None
+        self._host_task: Task[Any] | None = None
+        self._parent: CancelScope | None = None
+        self._child_scopes: set[CancelScope] = set()
+        # The tasks for which this is the innermost cancel scope
+        self._tasks: set[Task[Any]] = set()
+        self._active = False
+        # The deadline this scope has in the event loop's deadline heap
+        self._registered_deadline = inf
+
+    @property
+    def deadline(self) -> float:
+        return self._deadline
+
+    @deadline.setter
+    def deadline(self, value: float) -> None:
+        self._deadline = float(value)
+        if self._active:
+            self._register_deadline()
+
+    @property
+    def shield(self) -> bool:
+        return self._shield
+
+    @shield.setter
+    def shield(self, value: bool) -> None:
+        self._shield = value
+        if self._active:
+            self._update_cancel_status()
+
+    @property
+    def cancel_called(self) -> bool:
+        return self._cancel_called
+
+    @property
+    def cancelled_caught(self) -> bool:
+        return self._cancelled_caught
 
     def cancel(self) -> None:
-        pass
+        if self._cancel_called:
+            return
+
+        self._cancel_called = True
+        if self._active:
+            self._update_cancel_status()
+
+    def _update_cancel_status(self) -> None:
+        parent = self._parent
+        cancelled = self._cancel_called or (
+            not self._shield and parent is not None and parent._cancelled
+        )
+        if cancelled is self._cancelled:
+            return
+
+        self._cancelled = cancelled
+        if cancelled:
+            # The event loop wakes up the waiting tasks in bulk at the end of its
+            # current step; the rest get the exception the next time they suspend
+            assert self._loop is not None
+            self._loop._cancelled_scopes.append(self)
+
+        for scope in list(self._child_scopes):
+            scope._update_cancel_status()
+
+    def _register_deadline(self) -> None:
+        assert self._loop is not None
+        if self._deadline <= self._loop.time():
+            self.cancel()
+        elif self._deadline == inf:
+            if self._registered_deadline != inf:
+                self._loop._remove_deadline(self)
+        elif self._deadline != self._registered_deadline:
+            self._loop._add_deadline(self)
 
     def __enter__(self) -> Self:
+        from ._eventloop import current_event_loop
+
+        if self._host_task is not None:
+            raise RuntimeError(
+                "each CancelScope may only be used for a single 'with' block"
+            )
+
+        loop = current_event_loop()
+        task = loop._current_task
+        if task is None:
+            raise RuntimeError("cancel scopes can only be entered from a task")
+
+        self._loop = loop
+        self._host_task = task
+        self._parent = parent = task._cancel_scope
+        if parent is not None:
+            parent._child_scopes.add(self)
+            parent._tasks.discard(task)
+
+        task._cancel_scope = self
+        self._tasks.add(task)
+        self._active = True
+        self._cancelled = self._cancel_called or (
+            not self._shield and parent is not None and parent._cancelled
+        )
+        if self._deadline != inf:
+            self._register_deadline()
+
         return self
 
     def __exit__(
         self,
         exc_type: type[BaseException] | None,
-        exc_val: BaseException,
+        exc_val: BaseException | None,
         exc_tb: TracebackType | None,
-    ) -> None:
+    ) -> bool | None:
+        task = self._host_task
+        if not self._active or task is None:
+            raise RuntimeError("this cancel scope is not active")
+        elif task._cancel_scope is not self:
+            raise RuntimeError(
+                "cancel scopes must be exited in the reverse order of entering them"
+            )
+
+        self._active = False
+        self._tasks.discard(task)
+        task._cancel_scope = parent = self._parent
+        if parent is not None:
+            parent._child_scopes.discard(self)
+            parent._tasks.add(task)
+
+        if self._registered_deadline != inf:
+            assert self._loop is not None
+            self._loop._remove_deadline(self)
+
+        if self._cancel_called and isinstance(exc_val, CancelledError):
+            self._cancelled_caught = True
+            return True
+
         return None
 
 
@@ -86,47 +320,70 @@ class TaskGroup:
     _closed: bool = False
 
     def __init__(self) -> None:
-        from ._synchronization import Event
-
-        self._tasks = set[Task]()
         self._cancel_scope = CancelScope()
         self._exceptions: list[BaseException] = []
-        self._exit_event = Event()
+        # Number of child tasks that haven't finished yet
+        self._pending_tasks = 0
+        # Finished child tasks, in completion order (only collected if not None)
+        self._completed_tasks: deque[Task[Any]] | None = None
+        # Completed when the host task needs to be woken up by a finishing child
+        self._waiter: Future[None] | None = None
 
     def create_task(
-        self, coro: Coroutine[Any, Any, T_Retval], name: object = None
+        self,
+        coro: Coroutine[Any, Any, T_Retval],
+        name: object = None,
+        *,
+        eager: bool | None = None,
+        priority: int = 0,
     ) -> Task[T_Retval]:
         from asyncfusion._eventloop import current_event_loop
 
         if not self._entered:
             raise RuntimeError("this task group has not been entered yet")
 
-        task = Task(coro, str(name) if name else f"Task-{next(task_counter)}", self)
-        current_event_loop().reschedule_task(task)
-        self._tasks.add(task)
-        task.add_done_callback(self._task_done)
+        task = Task(coro, name or None, self)
+        if priority:
+            task.priority = priority
+
+        task._cancel_scope = self._cancel_scope
+        self._cancel_scope._tasks.add(task)
+        self._pending_tasks += 1
+        current_event_loop().start_task(task, eager=eager)
         return task
 
     def _task_done(self, task: Task[Any]) -> None:
-        self._tasks.remove(task)
-        if exc := task.exception():
+        # Called by the event loop when a child task finishes
+        self._pending_tasks -= 1
+        if task._cancel_scope is not None:
+            task._cancel_scope._tasks.discard(task)
+
+        # Cancellation of a child task is not an error
+        exc = task._exception
+        if exc is not None and not isinstance(exc, CancelledError):
             self._exceptions.append(exc)
             self._cancel_scope.cancel()
-            self._exit_event.set()
-        elif not self._tasks:
-            self._exit_event.set()
+
+        if self._completed_tasks is not None:
+            self._completed_tasks.append(task)
+
+        if self._waiter is not None and (
+            not self._pending_tasks or self._completed_tasks
+        ):
+            waiter, self._waiter = self._waiter, None
+            waiter.set_result(None)
 
     @property
     def cancel_scope(self) -> CancelScope:
         return self._cancel_scope
 
     async def __aenter__(self) -> Self:
-        self._cancel_scope.__enter__()
         if self._closed:
             raise RuntimeError("this task group has already been closed")
         elif self._entered:
             raise RuntimeError("this task group has already been entered")
 
+        self._cancel_scope.__enter__()
         self._entered = True
         return self
 
@@ -136,18 +393,103 @@ class TaskGroup:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> bool | None:
-        from ._synchronization import Event
-
         self._closed = True
-        if exc_val is not None:
+        if exc_val is not None and not isinstance(exc_val, CancelledError):
             self._exceptions.append(exc_val)
             self._cancel_scope.cancel()
 
-        while self._tasks:
-            await self._exit_event.wait()
-            self._exit_event = Event()
+        # Wait for the child tasks to finish; if the host task gets cancelled in the
+        # meantime, the children have been cancelled too, so just keep waiting
+        self._completed_tasks = None
+        if self._pending_tasks:
+            self._waiter = Future()
+            with CancelScope(shield=True):
+                await self._waiter
+
+        # Exiting the task group counts as a checkpoint for cancellation purposes
+        if exc_val is None and self._cancel_scope._cancelled:
+            exc_val = CancelledError()
+            exc_type = CancelledError
 
         if self._exceptions:
-            raise BaseExceptionGroup("", self._exceptions)
+            exc_val = BaseExceptionGroup(
+                "unhandled errors in a TaskGroup", self._exceptions
+            )
+            if self._cancel_scope.__exit__(type(exc_val), exc_val, None):
+                return True
+
+            raise exc_val
+        elif self._cancel_scope.__exit__(exc_type, exc_val, exc_tb):
+            return True
+        elif exc_val is not None:
+            raise exc_val
 
         return None
+
+
+class CompletedTasks(TaskGroup):
+    # A task group that can be iterated to get its child tasks as they finish
+    def __init__(self, coros: Iterable[Awaitable[Any]]) -> None:
+        super().__init__()
+        self._coros = coros
+        self._completed_tasks = deque()
+
+    async def __aenter__(self) -> Self:
+        await super().__aenter__()
+        for coro in self._coros:
+            self.create_task(_ensure_coroutine(coro))
+
+        del self._coros
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool | None:
+        # Leaving the block before every task has finished cancels the rest of them
+        if self._pending_tasks:
+            self._cancel_scope.cancel()
+
+        return await super().__aexit__(exc_type, exc_val, exc_tb)
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> Task[Any]:
+        assert self._completed_tasks is not None
+        if not self._completed_tasks:
+            if not self._pending_tasks:
+                raise StopAsyncIteration
+
+            self._waiter = Future()
+            await self._waiter
+
+        return self._completed_tasks.popleft()
+
+
+async def _await(awaitable: Awaitable[T_Retval]) -> T_Retval:
+    return await awaitable
+
+
+def _ensure_coroutine(
+    awaitable: Awaitable[T_Retval],
+) -> Coroutine[Any, Any, T_Retval]:
+    if isinstance(awaitable, Coroutine):
+        return awaitable
+
+    return _await(awaitable)
+
+
+async def gather(*awaitables: Awaitable[Any]) -> list[Any]:
+    # Run the awaitables concurrently and return their results in the same order
+    async with TaskGroup() as tg:
+        tasks = [tg.create_task(_ensure_coroutine(aw)) for aw in awaitables]
+
+    return [task._result for task in tasks]
+
+
+def as_completed(awaitables: Iterable[Awaitable[Any]]) -> CompletedTasks:
+    # Use as "async with as_completed(...) as tasks: async for task in tasks: ..."
+    return CompletedTasks(awaitables)
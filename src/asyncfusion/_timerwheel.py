@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from math import ceil, floor, inf
+from typing import Any
+
+# Each level of the wheel has 2**WHEEL_BITS slots, and a slot on each level spans as
+# many ticks as the whole level below it
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+WHEEL_LEVELS = 4
+
+
+class TimerWheel:
+    # A hierarchical timing wheel for timers that are mostly cancelled before they
+    # expire. A timer is any object with a _when attribute (the time it's due at) and
+    # a _timer_slot attribute, which the wheel points to the slot holding the timer,
+    # so it can be removed in constant time.
+    __slots__ = ("_resolution", "_levels", "_overflow", "_due", "_tick", "_count")
+
+    def __init__(self, resolution: float, now: float) -> None:
+        self._resolution = resolution
+        self._levels: list[list[dict[int, Any]]] = [
+            [{} for _ in range(WHEEL_SIZE)] for _ in range(WHEEL_LEVELS)
+        ]
+        # Timers too far in the future for the wheel, and timers that are already due
+        self._overflow: dict[int, Any] = {}
+        self._due: dict[int, Any] = {}
+        # The last tick that has been processed
+        self._tick = floor(now / resolution)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, timer: Any) -> None:
+        # Round up, so that timers never expire early
+        self._place(timer, ceil(timer._when / self._resolution))
+        self._count += 1
+
+    def remove(self, timer: Any) -> None:
+        if (slot := timer._timer_slot) is not None:
+            del slot[id(timer)]
+            timer._timer_slot = None
+            self._count -= 1
+
+    def _place(self, timer: Any, tick: int) -> None:
+        if tick <= self._tick:
+            slot = self._due
+        else:
+            # Go by the highest digit where the tick differs from the current one
+            level = ((tick ^ self._tick).bit_length() - 1) // WHEEL_BITS
+            if level < WHEEL_LEVELS:
+                index = (tick >> (level * WHEEL_BITS)) & WHEEL_MASK
+                slot = self._levels[level][index]
+            else:
+                slot = self._overflow
+
+        slot[id(timer)] = timer
+        timer._timer_slot = slot
+
+    def _next_tick(self) -> float:
+        # Find the next tick where a slot has timers to expire or to cascade down to
+        # the lower levels
+        tick = self._tick
+        for level, slots in enumerate(self._levels):
+            shift = level * WHEEL_BITS
+            for index in range(((tick >> shift) & WHEEL_MASK) + 1, WHEEL_SIZE):
+                if slots[index]:
+                    return ((tick >> shift) & ~WHEEL_MASK | index) << shift
+
+        if self._overflow:
+            shift = WHEEL_LEVELS * WHEEL_BITS
+            return ((tick >> shift) + 1) << shift
+
+        return inf
+
+    def next_expiry(self) -> float:
+        # The earliest time when expire() may have timers to return
+        if not self._count:
+            return inf
+        elif self._due:
+            return self._tick * self._resolution
+
+        return self._next_tick() * self._resolution
+
+    def expire(self, now: float) -> list[Any]:
+        # Return all the timers that are due at the given time, in no particular order
+        expired: list[Any] = []
+        if self._due:
+            self._collect(self._due, expired)
+
+        target = floor(now / self._resolution)
+        while self._count and (tick := self._next_tick()) <= target:
+            # Jump straight to the next tick with something to do, as nothing is
+            # scheduled for the ticks in between
+            self._tick = tick = int(tick)
+            self._cascade(tick)
+            self._collect(self._levels[0][tick & WHEEL_MASK], expired)
+            if self._due:
+                self._collect(self._due, expired)
+
+        if target > self._tick:
+            self._tick = target
+
+        return expired
+
+    def _cascade(self, tick: int) -> None:
+        # Redistribute the timers of the slots that start at this tick to the lower
+        # levels, starting from the highest level
+        if not tick & ((1 << (WHEEL_LEVELS * WHEEL_BITS)) - 1) and self._overflow:
+            self._replace(self._overflow)
+
+        for level in range(WHEEL_LEVELS - 1, 0, -1):
+            shift = level * WHEEL_BITS
+            if not tick & ((1 << shift) - 1):
+                slot = self._levels[level][(tick >> shift) & WHEEL_MASK]
+                if slot:
+                    self._replace(slot)
+
+    def _replace(self, slot: dict[int, Any]) -> None:
+        timers = list(slot.values())
+        slot.clear()
+        resolution = self._resolution
+        for timer in timers:
+            self._place(timer, ceil(timer._when / resolution))
+
+    def _collect(self, slot: dict[int, Any], expired: list[Any]) -> None:
+        for timer in slot.values():
+            timer._timer_slot = None
+            expired.append(timer)
+
+        self._count -= len(slot)
+        slot.clear()
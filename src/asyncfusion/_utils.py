@@ -1,5 +1,19 @@
 from __future__ import annotations
 
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._eventloop import EventLoop
+
+try:
+    from sniffio import current_async_library_cvar as current_async_library_cvar
+except ImportError:
+    # Keep track of the library anyway, for Task.async_library
+    current_async_library_cvar = ContextVar("current_async_library_cvar", default=None)
+
+current_event_loop_cvar: ContextVar[EventLoop] = ContextVar("current_event_loop")
+
 
 class Empty:
     __slots__ = ()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import sys
+import threading
+import traceback
+from time import monotonic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._eventloop import EventLoop
+
+# How many times per threshold the watchdog checks on the event loop
+CHECKS_PER_THRESHOLD = 4
+
+
+class Watchdog(threading.Thread):
+    # Watches the step counter of an event loop running in another thread, and dumps
+    # that thread's stack if the loop goes for too long without finishing a step
+    # while not waiting for I/O
+    def __init__(self, loop: EventLoop, threshold: float):
+        super().__init__(name="asyncfusion watchdog", daemon=True)
+        self.loop = loop
+        self.threshold = threshold
+        self.loop_thread_id = threading.get_ident()
+        self.stopped = threading.Event()
+        self.reports = 0
+
+    def run(self) -> None:
+        loop = self.loop
+        last_steps = loop._steps
+        last_progress = monotonic()
+        reported = False
+        while not self.stopped.wait(self.threshold / CHECKS_PER_THRESHOLD):
+            now = monotonic()
+            if loop._steps != last_steps or loop._waiting:
+                last_steps = loop._steps
+                last_progress = now
+                reported = False
+            elif not reported and now - last_progress >= self.threshold:
+                # Report each stall only once
+                reported = True
+                self.report(now - last_progress)
+
+    def report(self, stalled_for: float) -> None:
+        task = self.loop._current_task
+        running = f", running task {task.name!r}" if task is not None else ""
+        lines = [
+            f"asyncfusion watchdog: the event loop has been blocked for "
+            f"{stalled_for * 1000:.0f}ms{running}\n"
+        ]
+        if (frame := sys._current_frames().get(self.loop_thread_id)) is not None:
+            lines.append("Stack of the event loop thread (most recent call last):\n")
+            lines.extend(traceback.format_stack(frame))
+
+        self.reports += 1
+        sys.stderr.write("".join(lines))
+        sys.stderr.flush()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
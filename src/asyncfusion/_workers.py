@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import time
+import traceback
+from collections.abc import Callable
+from types import FrameType
+from typing import NoReturn
+
+# Signals that the supervisor passes on to every worker process
+forwarded_signals = (
+    signal.SIGINT,
+    signal.SIGTERM,
+    signal.SIGHUP,
+    signal.SIGUSR1,
+    signal.SIGUSR2,
+)
+# Signals that make the supervisor stop restarting workers
+stop_signals = (signal.SIGINT, signal.SIGTERM)
+# Workers that crash sooner than this (in seconds) after starting are restarted only
+# after this much time has passed, to avoid a tight crash loop
+min_worker_lifetime = 1.0
+
+
+def _run_worker(target: Callable[[], object]) -> NoReturn:
+    # Leave the supervisor's session, so that signals sent to the whole foreground
+    # process group by the terminal (like SIGINT on Ctrl-C) reach the worker only once,
+    # when the supervisor forwards them
+    os.setsid()
+
+    # Restore the default signal dispositions before letting the worker run
+    for signum in forwarded_signals:
+        signal.signal(signum, signal.SIG_DFL)
+
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, forwarded_signals)
+
+    exit_code = 1
+    try:
+        target()
+        exit_code = 0
+    except SystemExit as exc:
+        if exc.code is None:
+            exit_code = 0
+        elif isinstance(exc.code, int):
+            exit_code = exc.code
+        else:
+            print(exc.code, file=sys.stderr)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)
+
+
+class WorkerSupervisor:
+    def __init__(self, target: Callable[[], object], workers: int):
+        self._target = target
+        self._workers = workers
+        self._processes: dict[int, float] = {}  # process ID -> start time
+        self._stopping = False
+
+    def _spawn_worker(self) -> None:
+        # Block the forwarded signals until the child has reset its signal handlers
+        signal.pthread_sigmask(signal.SIG_BLOCK, forwarded_signals)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                _run_worker(self._target)
+
+            self._processes[pid] = time.monotonic()
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, forwarded_signals)
+
+    def _forward_signal(self, signum: int, frame: FrameType | None) -> None:
+        if signum in stop_signals:
+            self._stopping = True
+
+        for pid in self._processes:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        for signum in forwarded_signals:
+            signal.signal(signum, self._forward_signal)
+
+        for _ in range(self._workers):
+            self._spawn_worker()
+
+        exit_code = 0
+        while self._processes:
+            pid, status = os.wait()
+            started_at = self._processes.pop(pid, None)
+            if started_at is None:
+                continue
+
+            worker_exit_code = os.waitstatus_to_exitcode(status)
+            if self._stopping or worker_exit_code == 0:
+                continue
+
+            if worker_exit_code < 0:
+                reason = f"was killed by {signal.Signals(-worker_exit_code).name}"
+            else:
+                reason = f"exited with status {worker_exit_code}"
+
+            print(
+                f"asyncfusion: worker process {pid} {reason}; restarting it",
+                file=sys.stderr,
+            )
+            exit_code = 1
+            if time.monotonic() - started_at < min_worker_lifetime:
+                time.sleep(min_worker_lifetime)
+
+            if not self._stopping:
+                self._spawn_worker()
+
+        return exit_code
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from .futures import Future as Future
+from .processes import to_process as to_process
 from .runners import Runner as Runner
 from .runners import run as run
 from .streams import StreamReader as StreamReader
@@ -9,5 +10,19 @@ from .streams import open_connection as open_connection
 from .streams import open_unix_connection as open_unix_connection
 from .streams import start_server as start_server
 from .streams import start_unix_server as start_unix_server
+from .tasks import ALL_COMPLETED as ALL_COMPLETED
+from .tasks import FIRST_COMPLETED as FIRST_COMPLETED
+from .tasks import FIRST_EXCEPTION as FIRST_EXCEPTION
 from .tasks import Task as Task
+from .tasks import as_completed as as_completed
+from .tasks import create_task as create_task
+from .tasks import eager_task_factory as eager_task_factory
+from .tasks import ensure_future as ensure_future
+from .tasks import gather as gather
+from .tasks import shield as shield
+from .tasks import wait as wait
+from .tasks import wait_for as wait_for
 from .threads import to_thread as to_thread
+from .timeouts import Timeout as Timeout
+from .timeouts import timeout as timeout
+from .timeouts import timeout_at as timeout_at
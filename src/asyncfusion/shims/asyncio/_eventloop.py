@@ -1,36 +1,137 @@
 from __future__ import annotations
 
+import logging
 import sys
-from collections.abc import Awaitable
+from collections.abc import Awaitable, Callable, Coroutine
+from concurrent.futures import Executor
+from concurrent.futures import Future as ConcurrentFuture
+from contextvars import Context
+from functools import partial
 from socket import socket
-from typing import Any, TypeVar, Union
+from typing import TYPE_CHECKING, Any, TypeVar, Union
 
 import asyncfusion
 
-from .events import AbstractEventLoop
+from .events import AbstractEventLoop, Handle, TimerHandle
 from .futures import Future
+from .tasks import Task
 
 if sys.version_info >= (3, 12):
     from typing import Buffer
 else:
     from typing_extensions import Buffer
 
+if sys.version_info >= (3, 11):
+    from typing import TypeVarTuple, Unpack
+else:
+    from typing_extensions import TypeVarTuple, Unpack
+
 if sys.version_info >= (3, 10):
     from typing import TypeAlias
 else:
     from typing_extensions import TypeAlias
 
+if TYPE_CHECKING:
+    from asyncfusion.to_thread import WorkerThreadPool
+
+    from .events import TaskFactory, _Context, _ExceptionHandler
+
 _T = TypeVar("_T")
+_Ts = TypeVarTuple("_Ts")
 _Address: TypeAlias = Union[tuple[Any, ...], str, Buffer]
 
+# Errors are reported to the same logger as in asyncio, so existing logging setups
+# keep working
+logger = logging.getLogger("asyncio")
+
+
+def _copy_concurrent_result(
+    source: ConcurrentFuture[_T], destination: asyncfusion.Future[_T]
+) -> None:
+    if destination.done():
+        return
+    elif (exc := source.exception()) is not None:
+        destination.set_exception(exc)
+    else:
+        destination.set_result(source.result())
+
+
+async def _run_in_pool(
+    pool: WorkerThreadPool, func: Callable[[Unpack[_Ts]], _T], args: tuple[Unpack[_Ts]]
+) -> _T:
+    return await (await pool.submit_when_ready(func, args))
+
 
 class AsyncFusionEventLoop(AbstractEventLoop):
     def __init__(self, event_loop: asyncfusion.EventLoop):
         self._event_loop = event_loop
+        self._default_executor: Executor | None = None
+        self._task_factory: TaskFactory | None = None
+        self._exception_handler: _ExceptionHandler | None = None
 
     def time(self) -> float:
         return self._event_loop.time()
 
+    def get_debug(self) -> bool:
+        return self._event_loop.get_debug()
+
+    def set_debug(self, enabled: bool) -> None:
+        self._event_loop.set_debug(enabled)
+
+    @property
+    def slow_callback_duration(self) -> float:
+        return self._event_loop.slow_callback_duration
+
+    @slow_callback_duration.setter
+    def slow_callback_duration(self, value: float) -> None:
+        self._event_loop.slow_callback_duration = value
+
+    def call_soon(
+        self,
+        callback: Callable[[Unpack[_Ts]], object],
+        *args: Unpack[_Ts],
+        context: Context | None = None,
+    ) -> Handle:
+        handle = Handle(callback, args, self, context)
+        self._event_loop.call_soon(handle)
+        return handle
+
+    def call_soon_threadsafe(
+        self,
+        callback: Callable[[Unpack[_Ts]], object],
+        *args: Unpack[_Ts],
+        context: Context | None = None,
+    ) -> Handle:
+        handle = Handle(callback, args, self, context)
+        self._event_loop.call_soon_threadsafe(handle)
+        return handle
+
+    def call_later(
+        self,
+        delay: float,
+        callback: Callable[[Unpack[_Ts]], object],
+        *args: Unpack[_Ts],
+        context: Context | None = None,
+    ) -> TimerHandle:
+        # Count from the exact time, as the cached one may lag behind
+        when = self._event_loop.time_precise() + delay
+        return self.call_at(when, callback, *args, context=context)
+
+    def call_at(
+        self,
+        when: float,
+        callback: Callable[[Unpack[_Ts]], object],
+        *args: Unpack[_Ts],
+        context: Context | None = None,
+    ) -> TimerHandle:
+        timer = TimerHandle(when, callback, args, self, context)
+        self._event_loop.add_timer(timer)
+        return timer
+
+    def _timer_handle_cancelled(self, handle: TimerHandle) -> None:
+        # Take the timer off the wheel right away, rather than when it comes due
+        self._event_loop.remove_timer(handle)
+
     async def sock_connect(self, sock: socket, address: _Address) -> None:
         await self._event_loop.sock_connect(sock, address)
 
@@ -46,6 +147,113 @@ class AsyncFusionEventLoop(AbstractEventLoop):
     def create_future(self) -> Future[Any]:
         return Future()
 
+    def create_task(
+        self,
+        coro: Coroutine[Any, Any, _T],
+        *,
+        name: str | None = None,
+        context: Context | None = None,
+    ) -> Task[_T]:
+        if self._task_factory is not None:
+            return self._task_factory(self, coro, name=name, context=context)
+
+        task = Task(coro, name, None, context)
+        task._set_async_library("asyncio")
+        self._event_loop.start_task(task)
+        return task
+
+    def set_task_factory(self, factory: TaskFactory | None) -> None:
+        if factory is not None and not callable(factory):
+            raise TypeError("task factory must be a callable or None")
+
+        self._task_factory = factory
+
+    def get_task_factory(self) -> TaskFactory | None:
+        return self._task_factory
+
+    def run_in_executor(
+        self,
+        executor: Executor | None,
+        func: Callable[[Unpack[_Ts]], _T],
+        *args: Unpack[_Ts],
+    ) -> asyncfusion.Future[_T]:
+        if executor is None:
+            executor = self._default_executor
+
+        # Use the event loop's own thread pool unless a default executor has been set
+        if executor is None:
+            pool = self._event_loop.thread_pool
+            try:
+                return pool.submit(func, args)
+            except asyncfusion.WouldBlock:
+                # The pool's queue is full, so wait for room in it in a task
+                return self.create_task(_run_in_pool(pool, func, args))
+
+        future: asyncfusion.Future[_T] = asyncfusion.Future()
+        concurrent_future = executor.submit(func, *args)
+        concurrent_future.add_done_callback(
+            lambda f: self._event_loop.call_soon_threadsafe(
+                partial(_copy_concurrent_result, f, future)
+            )
+        )
+        return future
+
+    def set_default_executor(self, executor: Executor) -> None:
+        self._default_executor = executor
+
+    def set_exception_handler(self, handler: _ExceptionHandler | None) -> None:
+        if handler is not None and not callable(handler):
+            raise TypeError(f"A callable object or None is expected, got {handler!r}")
+
+        self._exception_handler = handler
+
+    def get_exception_handler(self) -> _ExceptionHandler | None:
+        return self._exception_handler
+
+    def default_exception_handler(self, context: _Context) -> None:
+        message = context.get("message") or "Unhandled exception in event loop"
+        exception = context.get("exception")
+        details = [
+            f"{key}: {value!r}"
+            for key, value in sorted(context.items())
+            if key not in ("message", "exception")
+        ]
+        logger.error("\n".join([message, *details]), exc_info=exception or False)
+
+    def call_exception_handler(self, context: _Context) -> None:
+        if self._exception_handler is None:
+            try:
+                self.default_exception_handler(context)
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException:
+                logger.error("Exception in default exception handler", exc_info=True)
+
+            return
+
+        try:
+            self._exception_handler(self, context)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            # Fall back to the default handler, as asyncio does
+            try:
+                self.default_exception_handler(
+                    {
+                        "message": "Unhandled error in exception handler",
+                        "exception": exc,
+                        "context": context,
+                    }
+                )
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException:
+                logger.error(
+                    "Exception in default exception handler while handling an "
+                    "unexpected error in custom exception handler",
+                    exc_info=True,
+                )
+
     def run_until_complete(self, future: Awaitable[_T]) -> _T:
         raise NotImplementedError
 
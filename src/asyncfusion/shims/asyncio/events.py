@@ -4,7 +4,7 @@ import ssl
 import sys
 import threading
 from abc import ABCMeta, abstractmethod
-from collections.abc import Callable, Coroutine, Sequence
+from collections.abc import Callable, Sequence
 from contextvars import Context
 from functools import total_ordering
 from socket import AddressFamily, SocketKind, socket
@@ -22,6 +22,8 @@ else:
     from typing_extensions import TypeAlias
 
 if TYPE_CHECKING:
+    import asyncfusion
+
     from .futures import Future
     from .tasks import Task
 
@@ -32,9 +34,8 @@ _Context: TypeAlias = dict[str, Any]
 _ExceptionHandler: TypeAlias = Callable[[AbstractEventLoop, _Context], object]
 _ProtocolFactory: TypeAlias = Callable[[], BaseProtocol]
 _SSLContext: TypeAlias = Union[bool, None, ssl.SSLContext]
-TaskFactory: TypeAlias = Callable[
-    ["AbstractEventLoop", Coroutine[Any, Any, _T]], Task[_T]
-]
+# Called as factory(loop, coro, name=..., context=...)
+TaskFactory: TypeAlias = Callable[..., "Task[Any]"]
 
 
 class _AsyncioLocal(threading.local):
@@ -67,7 +68,33 @@ class Handle:
             self._args = None
 
     def _run(self) -> None:
-        self._callback(*self._args)
+        # The handle may have been cancelled after it was scheduled to run
+        if self._cancelled:
+            return
+
+        callback, args = self._callback, self._args
+        assert callback is not None and args is not None
+        try:
+            if self._context is not None:
+                self._context.run(callback, *args)
+            else:
+                callback(*args)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            # Report the error like asyncio does, instead of letting it escape from
+            # the event loop
+            self._loop.call_exception_handler(
+                {
+                    "message": f"Exception in callback {callback!r}",
+                    "exception": exc,
+                    "handle": self,
+                }
+            )
+
+    # The event loop runs handles like any other callback, so they can go on its ready
+    # queue as they are
+    __call__ = _run
 
     def cancelled(self) -> bool:
         return self._cancelled
@@ -78,6 +105,9 @@ class Handle:
 
 @total_ordering
 class TimerHandle(Handle):
+    # _timer_slot is managed by the event loop's timer wheel
+    __slots__ = ("_when", "_timer_slot")
+
     def __init__(
         self,
         when: float,
@@ -88,6 +118,13 @@ class TimerHandle(Handle):
     ) -> None:
         super().__init__(callback, args, loop, context)
         self._when = when
+        self._timer_slot: dict[int, TimerHandle] | None = None
+
+    def cancel(self) -> None:
+        if not self._cancelled:
+            self._loop._timer_handle_cancelled(self)  # type: ignore[attr-defined]
+
+        super().cancel()
 
     def __hash__(self) -> int:
         return hash(self._when)
@@ -240,7 +277,7 @@ class AbstractEventLoop(metaclass=ABCMeta):
     @abstractmethod
     def run_in_executor(
         self, executor: Any, func: Callable[[Unpack[_Ts]], _T], *args: Unpack[_Ts]
-    ) -> Future[_T]:
+    ) -> asyncfusion.Future[_T]:
         pass
 
     @abstractmethod
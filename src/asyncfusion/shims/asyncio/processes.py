@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from typing import TypeVar
+
+import asyncfusion
+
+if sys.version_info >= (3, 11):
+    from typing import TypeVarTuple, Unpack
+else:
+    from typing_extensions import TypeVarTuple, Unpack
+
+PosArgsT = TypeVarTuple("PosArgsT")
+T_Retval = TypeVar("T_Retval")
+
+
+async def to_process(
+    func: Callable[[Unpack[PosArgsT]], T_Retval], /, *args: Unpack[PosArgsT]
+) -> T_Retval:
+    return await asyncfusion.to_process.run_sync(func, *args)
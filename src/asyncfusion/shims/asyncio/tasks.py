@@ -1,13 +1,29 @@
 from __future__ import annotations
 
 import sys
-from collections.abc import Awaitable, Coroutine, Generator, Iterable, Iterator
-from typing import Any, Generic, TypeVar, Union, overload
+from collections import deque
+from collections.abc import Awaitable, Coroutine, Generator, Iterable
+from concurrent.futures import ALL_COMPLETED as ALL_COMPLETED
+from concurrent.futures import FIRST_COMPLETED as FIRST_COMPLETED
+from concurrent.futures import FIRST_EXCEPTION as FIRST_EXCEPTION
+from contextvars import Context
+from functools import partial
+from math import inf
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, Union, overload
 
 import asyncfusion
 
+from . import timeouts
 from .futures import Future
 
+if TYPE_CHECKING:
+    from .events import AbstractEventLoop
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
 if sys.version_info >= (3, 10):
     from typing import TypeAlias
 else:
@@ -17,14 +33,270 @@ _T = TypeVar("_T")
 _FutureLike: TypeAlias = Union[Future[_T], Generator[Any, None, _T], Awaitable[_T]]
 
 
+async def _await(awaitable: Awaitable[_T]) -> _T:
+    return await awaitable
+
+
+def ensure_future(
+    coro_or_future: _FutureLike[_T], *, loop: AbstractEventLoop | None = None
+) -> asyncfusion.Future[_T]:
+    if isinstance(coro_or_future, asyncfusion.Future):
+        return coro_or_future
+    elif isinstance(coro_or_future, Coroutine):
+        coro = coro_or_future
+    elif isinstance(coro_or_future, Awaitable):
+        coro = _await(coro_or_future)
+    else:
+        raise TypeError("An asyncio.Future, a coroutine or an awaitable is required")
+
+    if loop is not None:
+        return loop.create_task(coro)
+
+    return create_task(coro)
+
+
+class _GatheringFuture(asyncfusion.Future[list[Any]]):
+    # Tracks the children with a single counter and one bound method shared by all of
+    # them as the done callback, so finishing a child is O(1)
+    __slots__ = ("_children", "_pending", "_return_exceptions", "_cancel_requested")
+
+    def __init__(
+        self, children: list[asyncfusion.Future[Any]], return_exceptions: bool
+    ) -> None:
+        super().__init__()
+        self._children = children
+        self._return_exceptions = return_exceptions
+        self._cancel_requested = False
+        unique_children = dict.fromkeys(children)
+        self._pending = len(unique_children)
+        callback = self._child_done
+        for child in unique_children:
+            child.add_done_callback(callback)
+
+    def _child_done(self, child: asyncfusion.Future[Any]) -> None:
+        if self._done:
+            return
+
+        self._pending -= 1
+        if not self._return_exceptions and child._exception is not None:
+            self.set_exception(child._exception)
+        elif not self._pending:
+            if self._cancel_requested:
+                self.set_exception(asyncfusion.CancelledError())
+            else:
+                self.set_result(
+                    [
+                        child._result if child._exception is None else child._exception
+                        for child in self._children
+                    ]
+                )
+
+    def cancel(self, msg: str | None = None) -> bool:
+        if self._done:
+            return False
+
+        cancelled = False
+        for child in self._children:
+            if isinstance(child, asyncfusion.Task) and child.cancel(msg):
+                cancelled = True
+
+        self._cancel_requested |= cancelled
+        return cancelled
+
+    def __await__(self) -> Generator[Any, Any, list[Any]]:
+        # Cancelling the awaiting task cancels the children too, like in asyncio
+        try:
+            return (yield from super().__await__())
+        except asyncfusion.CancelledError:
+            self.cancel()
+            raise
+
+
+def gather(
+    *coros_or_futures: _FutureLike[Any], return_exceptions: bool = False
+) -> asyncfusion.Future[list[Any]]:
+    children = [ensure_future(arg) for arg in coros_or_futures]
+    if not children:
+        future: asyncfusion.Future[list[Any]] = asyncfusion.Future()
+        future.set_result([])
+        return future
+
+    return _GatheringFuture(children, return_exceptions)
+
+
+class _Waiter(asyncfusion.Future[None]):
+    # Completes when enough of the given futures are done for wait() to return
+    __slots__ = ("_pending", "_return_when")
+
+    def __init__(self, pending: int, return_when: str) -> None:
+        super().__init__()
+        self._pending = pending
+        self._return_when = return_when
+
+    def _future_done(self, future: asyncfusion.Future[Any]) -> None:
+        self._pending -= 1
+        if not self._done and (
+            not self._pending
+            or self._return_when == FIRST_COMPLETED
+            or (
+                self._return_when == FIRST_EXCEPTION
+                and future._exception is not None
+                and not isinstance(future._exception, asyncfusion.CancelledError)
+            )
+        ):
+            self.set_result(None)
+
+
+async def wait(
+    fs: Iterable[asyncfusion.Future[_T]],
+    *,
+    timeout: float | None = None,
+    return_when: str = ALL_COMPLETED,
+) -> tuple[set[asyncfusion.Future[_T]], set[asyncfusion.Future[_T]]]:
+    fs = set(fs)
+    if not fs:
+        raise ValueError("Set of Tasks/Futures is empty.")
+    elif return_when not in (FIRST_COMPLETED, FIRST_EXCEPTION, ALL_COMPLETED):
+        raise ValueError(f"Invalid return_when value: {return_when}")
+    elif any(isinstance(f, Coroutine) for f in fs):
+        raise TypeError("Passing coroutines is forbidden, use tasks explicitly.")
+
+    waiter = _Waiter(len(fs), return_when)
+    callback = waiter._future_done
+    for f in fs:
+        f.add_done_callback(callback)
+
+    deadline = inf
+    if timeout is not None:
+        deadline = asyncfusion.current_event_loop().time_precise() + timeout
+
+    try:
+        with asyncfusion.CancelScope(deadline=deadline):
+            await waiter
+    finally:
+        for f in fs:
+            f.remove_done_callback(callback)
+
+    done = {f for f in fs if f._done}
+    return done, fs - done
+
+
+class _AsCompletedIterator(Generic[_T]):
+    # Finished futures are put in a queue by a done callback shared by all of them
+    def __init__(self, fs: Iterable[_FutureLike[_T]], timeout: float | None) -> None:
+        self._completed: deque[asyncfusion.Future[_T]] = deque()
+        self._waiter: asyncfusion.Future[None] | None = None
+        self._deadline = inf
+        if timeout is not None:
+            self._deadline = asyncfusion.current_event_loop().time_precise() + timeout
+
+        todo = {ensure_future(f): None for f in fs}
+        self._remaining = len(todo)
+        callback = self._future_done
+        for f in todo:
+            f.add_done_callback(callback)
+
+    def _future_done(self, future: asyncfusion.Future[_T]) -> None:
+        self._completed.append(future)
+        if self._waiter is not None:
+            waiter, self._waiter = self._waiter, None
+            waiter.set_result(None)
+
+    async def _wait_for_one(self) -> asyncfusion.Future[_T]:
+        if not self._completed:
+            self._waiter = asyncfusion.Future()
+            with asyncfusion.CancelScope(deadline=self._deadline) as scope:
+                await self._waiter
+
+            if scope.cancelled_caught:
+                raise TimeoutError
+
+        return self._completed.popleft()
+
+    async def _wait_for_one_result(self) -> _T:
+        return (await self._wait_for_one()).result()
+
+    def __iter__(self) -> Self:
+        return self
+
+    def __next__(self) -> Coroutine[Any, Any, _T]:
+        if not self._remaining:
+            raise StopIteration
+
+        self._remaining -= 1
+        return self._wait_for_one_result()
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> asyncfusion.Future[_T]:
+        if not self._remaining:
+            raise StopAsyncIteration
+
+        self._remaining -= 1
+        return await self._wait_for_one()
+
+
 def as_completed(
     fs: Iterable[_FutureLike[_T]], *, timeout: float | None = None
-) -> Iterator[Future[_T]]:
-    raise NotImplementedError
+) -> _AsCompletedIterator[_T]:
+    return _AsCompletedIterator(fs, timeout)
 
 
-def shield(arg: _FutureLike[_T]) -> Future[_T]:
-    raise NotImplementedError
+def create_task(
+    coro: Coroutine[Any, Any, _T],
+    *,
+    name: str | None = None,
+    context: Context | None = None,
+) -> Task[_T]:
+    from .events import get_running_loop
+
+    return get_running_loop().create_task(coro, name=name, context=context)
+
+
+def eager_task_factory(
+    loop: AbstractEventLoop,
+    coro: Coroutine[Any, Any, _T],
+    *,
+    name: str | None = None,
+    context: Context | None = None,
+) -> Task[_T]:
+    # Run the coroutine right away until it first suspends, like on CPython 3.12+
+    task = Task(coro, name, None, context)
+    task._set_async_library("asyncio")
+    asyncfusion.current_event_loop().start_task(task, eager=True)
+    return task
+
+
+def _copy_outcome(outer: asyncfusion.Future[_T], inner: asyncfusion.Future[_T]) -> None:
+    if not outer._done:
+        if inner._exception is not None:
+            outer.set_exception(inner._exception)
+        else:
+            outer.set_result(inner._result)
+
+
+class _ShieldedFuture(asyncfusion.Future[_T]):
+    # Takes on the outcome of the inner future, but cancelling it (directly or by
+    # cancelling the task awaiting it) leaves the inner future running
+    __slots__ = ()
+
+    def cancel(self, msg: str | None = None) -> bool:
+        if self._done:
+            return False
+
+        self.set_exception(asyncfusion.CancelledError(msg))
+        return True
+
+
+def shield(arg: _FutureLike[_T]) -> asyncfusion.Future[_T]:
+    inner = ensure_future(arg)
+    if inner._done:
+        return inner
+
+    outer: _ShieldedFuture[_T] = _ShieldedFuture()
+    inner.add_done_callback(partial(_copy_outcome, outer))
+    return outer
 
 
 @overload
@@ -41,10 +313,31 @@ async def sleep(delay: float, result: _T | None = None) -> _T | None:
 
 
 async def wait_for(fut: _FutureLike[_T], timeout: float | None) -> _T:
-    raise NotImplementedError
+    if not isinstance(fut, Awaitable):
+        raise TypeError("An asyncio.Future, a coroutine or an awaitable is required")
+    elif timeout is None:
+        return await fut
+
+    async with timeouts.timeout(timeout):
+        try:
+            return await fut
+        except asyncfusion.CancelledError:
+            # Don't leave the awaited task running after the timeout, and like asyncio,
+            # only return once it has actually finished
+            if isinstance(fut, asyncfusion.Task) and fut.cancel():
+                with asyncfusion.CancelScope(shield=True):
+                    try:
+                        await fut
+                    except BaseException:
+                        # Only the task finishing matters here, not its outcome
+                        pass
+
+            raise
 
 
 class Task(Generic[_T], asyncfusion.Task[_T]):
+    __slots__ = ()
+
     def get_coro(self) -> Coroutine[Any, Any, Any]:
         return self._coro
 
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sys
+from math import inf
+from types import TracebackType
+from typing import final
+
+import asyncfusion
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+
+@final
+class Timeout:
+    def __init__(self, when: float | None) -> None:
+        self._when = when
+        self._scope: asyncfusion.CancelScope | None = None
+        # Set once the deadline has been hit and turned into a TimeoutError
+        self._expired = False
+
+    def when(self) -> float | None:
+        return self._when
+
+    def reschedule(self, when: float | None) -> None:
+        self._when = when
+        if self._scope is not None:
+            self._scope.deadline = inf if when is None else when
+
+    def expired(self) -> bool:
+        return self._expired
+
+    async def __aenter__(self) -> Self:
+        if self._scope is not None:
+            raise RuntimeError("Timeout has already been entered")
+
+        deadline = inf if self._when is None else self._when
+        self._scope = asyncfusion.CancelScope(deadline=deadline)
+        self._scope.__enter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool | None:
+        assert self._scope is not None
+        if self._scope.__exit__(exc_type, exc_val, exc_tb):
+            self._expired = True
+            raise TimeoutError from exc_val
+
+        return None
+
+
+def timeout(delay: float | None) -> Timeout:
+    if delay is None:
+        return Timeout(None)
+
+    return Timeout(asyncfusion.current_event_loop().time_precise() + delay)
+
+
+def timeout_at(when: float | None) -> Timeout:
+    return Timeout(when)
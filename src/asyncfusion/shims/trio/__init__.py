@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from asyncfusion import CancelScope as CancelScope
+
 from ._channel import MemoryReceiveChannel as MemoryReceiveChannel
 from ._channel import MemorySendChannel as MemorySendChannel
 from ._channel import open_memory_channel as open_memory_channel
 from ._eventloop import TrioToken as TrioToken
+from ._eventloop import current_time as current_time
 from ._eventloop import run as run
 from ._eventloop import sleep as sleep
 from ._eventloop import sleep_forever as sleep_forever
 from ._eventloop import sleep_until as sleep_until
 from ._exceptions import Cancelled as Cancelled
 from ._exceptions import TooSlowError as TooSlowError
+from ._streams import SocketStream as SocketStream
+from ._streams import open_tcp_stream as open_tcp_stream
 from ._sync import CapacityLimiter as CapacityLimiter
 from ._sync import Event as Event
 from ._sync import Lock as Lock
@@ -18,3 +23,7 @@ from ._tasks import TASK_STATUS_IGNORED as TASK_STATUS_IGNORED
 from ._tasks import Nursery as Nursery
 from ._tasks import TaskStatus as TaskStatus
 from ._tasks import open_nursery as open_nursery
+from ._timeouts import fail_after as fail_after
+from ._timeouts import fail_at as fail_at
+from ._timeouts import move_on_after as move_on_after
+from ._timeouts import move_on_at as move_on_at
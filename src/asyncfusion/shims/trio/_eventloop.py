@@ -6,6 +6,7 @@ from contextvars import ContextVar
 from typing import Any, TypeVar
 
 import asyncfusion
+from asyncfusion._utils import current_async_library_cvar
 
 if sys.version_info >= (3, 11):
     from typing import TypeVarTuple, Unpack
@@ -35,8 +36,18 @@ class TrioToken:
         raise NotImplementedError
 
 
-def run(callback: Callable[..., Coroutine[Any, Any, T_Retval]]) -> T_Retval:
-    return asyncfusion.run(callback())
+async def _run_as_trio(coro: Coroutine[Any, Any, T_Retval]) -> T_Retval:
+    # Make sniffio report trio in the main task (and the tasks it spawns)
+    current_async_library_cvar.set("trio")
+    return await coro
+
+
+def run(
+    callback: Callable[..., Coroutine[Any, Any, T_Retval]],
+    *,
+    clock: asyncfusion.Clock | None = None,
+) -> T_Retval:
+    return asyncfusion.run(_run_as_trio(callback()), clock=clock)
 
 
 def current_trio_token() -> TrioToken:
@@ -4,16 +4,13 @@ from asyncfusion import _exceptions
 
 TooSlowError = TimeoutError
 Cancelled = _exceptions.CancelledError
+WouldBlock = _exceptions.WouldBlock
 
 
 class NeedHandshakeError(Exception):
     pass
 
 
-class WouldBlock(Exception):
-    pass
-
-
 class BusyResourceError(Exception):
     pass
 
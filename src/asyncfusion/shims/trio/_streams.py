@@ -3,10 +3,12 @@ from __future__ import annotations
 import sys
 from collections.abc import Awaitable, Callable
 from os import PathLike
+from socket import IPPROTO_TCP, SHUT_WR, TCP_NODELAY
 from ssl import SSLContext
 from typing import Generic, TypeVar
 
-from submodules.trio.src.trio import CancelScope
+import asyncfusion
+from asyncfusion import CancelScope
 
 from ._tasks import TASK_STATUS_IGNORED, Nursery, TaskStatus
 from .abc import AsyncResource, HalfCloseableStream, ReceiveStream, SendStream
@@ -22,8 +24,28 @@ SendStreamT = TypeVar("SendStreamT", bound=SendStream)
 ReceiveStreamT = TypeVar("ReceiveStreamT", bound=ReceiveStream)
 
 
-class SocketStream:
-    pass
+class SocketStream(HalfCloseableStream):
+    def __init__(self, socket: asyncfusion.AsyncSocket):
+        self.socket = socket
+        try:
+            self.socket.setsockopt(IPPROTO_TCP, TCP_NODELAY, True)
+        except OSError:
+            pass
+
+    async def send_all(self, data: Buffer) -> None:
+        await self.socket.sendall(data)
+
+    async def wait_send_all_might_not_block(self) -> None:
+        await self.socket.wait_writable()
+
+    async def send_eof(self) -> None:
+        self.socket.shutdown(SHUT_WR)
+
+    async def receive_some(self, max_bytes: int | None = None) -> bytes:
+        return await self.socket.recv(max_bytes or 65536)
+
+    async def aclose(self) -> None:
+        await self.socket.aclose()
 
 
 class SSLStream(Generic[T_Stream]):
@@ -45,7 +67,16 @@ async def open_tcp_stream(
     happy_eyeballs_delay: float | None = 0.25,
     local_address: str | None = None,
 ) -> SocketStream:
-    raise NotImplementedError
+    if isinstance(host, bytes):
+        host = host.decode("ascii")
+
+    sock = await asyncfusion.connect_tcp(
+        host,
+        port,
+        happy_eyeballs_delay=happy_eyeballs_delay,
+        local_address=local_address,
+    )
+    return SocketStream(sock)
 
 
 async def serve_tcp(
@@ -29,7 +29,9 @@ class Nursery:
         *args: Any,
         name: object,
     ) -> None:
-        self._task_group.create_task(async_fn(*args), name=name)
+        # Trio never runs a new task before the next checkpoint
+        task = self._task_group.create_task(async_fn(*args), name=name, eager=False)
+        task._set_async_library("trio")
 
     @property
     def cancel_scope(self) -> asyncfusion.CancelScope:
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager
+
+import asyncfusion
+
+from ._exceptions import TooSlowError
+
+
+def move_on_at(deadline: float, *, shield: bool = False) -> asyncfusion.CancelScope:
+    if math.isnan(deadline):
+        raise ValueError("deadline must not be NaN")
+
+    return asyncfusion.CancelScope(deadline=deadline, shield=shield)
+
+
+def move_on_after(seconds: float, *, shield: bool = False) -> asyncfusion.CancelScope:
+    if seconds < 0:
+        raise ValueError("timeout must be non-negative")
+
+    return move_on_at(
+        asyncfusion.current_event_loop().time_precise() + seconds, shield=shield
+    )
+
+
+@contextmanager
+def fail_at(
+    deadline: float, *, shield: bool = False
+) -> Generator[asyncfusion.CancelScope, None, None]:
+    with move_on_at(deadline, shield=shield) as scope:
+        yield scope
+
+    if scope.cancelled_caught:
+        raise TooSlowError
+
+
+def fail_after(
+    seconds: float, *, shield: bool = False
+) -> AbstractContextManager[asyncfusion.CancelScope]:
+    if seconds < 0:
+        raise ValueError("timeout must be non-negative")
+
+    return fail_at(
+        asyncfusion.current_event_loop().time_precise() + seconds, shield=shield
+    )
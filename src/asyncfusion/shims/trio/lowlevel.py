@@ -18,10 +18,6 @@ class RunStatistics:
     io_statistics: object
 
 
-class Clock:
-    pass
-
-
 class Task:
     def __init__(self, original: asyncfusion.Task):
         self._original = original
@@ -36,7 +32,7 @@ class Task:
 
     @property
     def context(self) -> str:
-        return self._original._context
+        return self._original._own_context()
 
     @property
     def parent_nursery(self) -> Nursery:
@@ -52,12 +48,16 @@ class Task:
         return hash(self._original)
 
 
+Clock = asyncfusion.Clock
+checkpoint = asyncfusion.checkpoint
+
+
 def current_statistics() -> RunStatistics:
     raise NotImplementedError
 
 
 def current_clock() -> Clock:
-    raise NotImplementedError
+    return asyncfusion.current_event_loop().clock
 
 
 def current_root_task() -> Task:
@@ -65,4 +65,4 @@ def current_root_task() -> Task:
 
 
 def current_task() -> Task:
-    raise NotImplementedError
+    return Task(asyncfusion.current_task())
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TypeVar
+
+import asyncfusion
+
+from ._sync import CapacityLimiter
+
+RetT = TypeVar("RetT")
+
+
+async def run_sync(
+    sync_fn: Callable[..., RetT],
+    *args: object,
+    limiter: CapacityLimiter | None = None,
+) -> RetT:
+    return await asyncfusion.to_process.run_sync(sync_fn, *args, limiter=limiter)
+
+
+def current_default_process_limiter() -> CapacityLimiter:
+    return asyncfusion.to_process.current_default_process_limiter()
@@ -3,6 +3,8 @@ from __future__ import annotations
 from collections.abc import Callable
 from typing import TypeVar
 
+import asyncfusion
+
 from ._sync import CapacityLimiter
 
 RetT = TypeVar("RetT")
@@ -16,8 +18,23 @@ async def run_sync(
     cancellable: bool | None = None,
     limiter: CapacityLimiter | None = None,
 ) -> RetT:
-    raise NotImplementedError
+    # cancellable is the deprecated name of abandon_on_cancel
+    if cancellable is not None:
+        if abandon_on_cancel is not None:
+            raise ValueError(
+                "Cannot set `cancellable` and `abandon_on_cancel` simultaneously."
+            )
+
+        abandon_on_cancel = cancellable
+
+    return await asyncfusion.to_thread.run_sync(
+        sync_fn,
+        *args,
+        thread_name=thread_name,
+        abandon_on_cancel=bool(abandon_on_cancel),
+        limiter=limiter,
+    )
 
 
 def current_default_thread_limiter() -> CapacityLimiter:
-    raise NotImplementedError
+    return asyncfusion.to_thread.current_default_thread_limiter()
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import socket
+import subprocess
+import sys
+from collections import deque
+from collections.abc import Callable, Coroutine
+from multiprocessing.shared_memory import SharedMemory
+from runpy import run_path
+from struct import Struct
+from time import monotonic
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+from ._eventloop import current_event_loop
+from ._exceptions import BrokenWorkerProcess
+from ._sockets import AsyncSocket, _abort_connections
+from ._tasks import CancelScope, Task
+from .to_thread import run_sync as run_sync_in_thread
+
+if sys.version_info >= (3, 11):
+    from typing import TypeVarTuple, Unpack
+else:
+    from typing_extensions import TypeVarTuple, Unpack
+
+if TYPE_CHECKING:
+    from ._eventloop import EventLoop
+    from ._synchronization import CapacityLimiter
+
+T_Retval = TypeVar("T_Retval")
+PosArgsT = TypeVarTuple("PosArgsT")
+
+MAX_IDLE_TIME = 300  # seconds an idle worker process is kept around for reuse
+# Bytes-like arguments at least this large are passed through shared memory
+SHARED_MEMORY_THRESHOLD = 65536
+header = Struct("!Q")
+
+
+class SharedBuffer(NamedTuple):
+    name: str
+    size: int
+    kind: str
+
+
+def _share_large_buffer(arg: Any, segments: list[SharedMemory]) -> Any:
+    if isinstance(arg, (bytes, bytearray, memoryview)):
+        view = memoryview(arg).cast("B")
+        if view.nbytes >= SHARED_MEMORY_THRESHOLD:
+            segment = SharedMemory(create=True, size=view.nbytes)
+            segments.append(segment)
+            assert segment.buf is not None
+            segment.buf[: view.nbytes] = view
+            return SharedBuffer(segment.name, view.nbytes, type(arg).__name__)
+
+    return arg
+
+
+def _attach_shared_buffer(arg: Any, mappings: list[mmap.mmap]) -> Any:
+    if not isinstance(arg, SharedBuffer):
+        return arg
+
+    fd = os.open(f"/dev/shm/{arg.name}", os.O_RDONLY)
+    try:
+        mapping = mmap.mmap(fd, arg.size, prot=mmap.PROT_READ)
+    finally:
+        os.close(fd)
+
+    mappings.append(mapping)
+    if arg.kind == "bytearray":
+        return bytearray(mapping)
+    elif arg.kind == "memoryview":
+        return memoryview(mapping)
+    else:
+        return mapping[:]
+
+
+def _receive_exactly_blocking(sock: socket.socket, length: int) -> bytes:
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            raise EOFError
+
+        view = view[received:]
+
+    return bytes(buffer)
+
+
+async def _receive_exactly(sock: AsyncSocket, length: int) -> bytes:
+    chunks: list[bytes] = []
+    while length:
+        chunk = await sock.recv(length)
+        if not chunk:
+            raise BrokenWorkerProcess("the worker process exited unexpectedly")
+
+        chunks.append(chunk)
+        length -= len(chunk)
+
+    return b"".join(chunks)
+
+
+async def _send_message(sock: AsyncSocket, payload: bytes) -> None:
+    await sock.sendall(header.pack(len(payload)) + payload)
+
+
+async def _receive_message(sock: AsyncSocket) -> bytes:
+    (length,) = header.unpack(await _receive_exactly(sock, header.size))
+    return await _receive_exactly(sock, length)
+
+
+async def _exchange(sock: AsyncSocket, request: bytes) -> bytes:
+    await _send_message(sock, request)
+    del request
+    return await _receive_message(sock)
+
+
+class WorkerProcess:
+    __slots__ = ("process", "sock", "idle_since")
+
+    def __init__(self, process: subprocess.Popen[bytes], sock: AsyncSocket):
+        self.process = process
+        self.sock = sock
+        self.idle_since = monotonic()
+
+    def kill(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+
+
+def _spawn_process(child_fd: int) -> subprocess.Popen[bytes]:
+    command = [
+        sys.executable,
+        "-c",
+        "from asyncfusion.to_process import process_worker; process_worker()",
+        str(child_fd),
+    ]
+    return subprocess.Popen(command, stdin=subprocess.DEVNULL, pass_fds=(child_fd,))
+
+
+class ProcessWorkerPool:
+    def __init__(self, loop: EventLoop):
+        self.loop = loop
+        self.workers: set[WorkerProcess] = set()
+        self.idle_workers: deque[WorkerProcess] = deque()
+
+    async def acquire_worker(self) -> WorkerProcess:
+        # Stop the workers that have been idle for too long (the oldest ones are on
+        # the left)
+        expiry_time = monotonic() - MAX_IDLE_TIME
+        while self.idle_workers and self.idle_workers[0].idle_since < expiry_time:
+            await self.discard_worker(self.idle_workers.popleft())
+
+        # Reuse the most recently idled worker that is still alive (it may have
+        # crashed or been killed while idle)
+        while self.idle_workers:
+            worker = self.idle_workers.pop()
+            if worker.process.poll() is None:
+                return worker
+
+            await self.discard_worker(worker)
+
+        # Spawn a new worker in a thread, as forking a large process can take a while
+        parent_sock, child_sock = socket.socketpair()
+        try:
+            process = await run_sync_in_thread(_spawn_process, child_sock.fileno())
+        finally:
+            child_sock.close()
+
+        sock = AsyncSocket(
+            parent_sock.family,
+            parent_sock.type,
+            parent_sock.proto,
+            parent_sock.detach(),
+        )
+        worker = WorkerProcess(process, sock)
+        self.workers.add(worker)
+        main_path = getattr(sys.modules["__main__"], "__file__", None)
+        await self.communicate(
+            worker, _send_message(worker.sock, pickle.dumps((sys.path, main_path)))
+        )
+        return worker
+
+    async def communicate(
+        self, worker: WorkerProcess, coro: Coroutine[Any, Any, T_Retval]
+    ) -> T_Retval:
+        # Talk to the worker in a separate task, so that if this fails or gets
+        # cancelled, the ring operation left pending on the worker's socket can be
+        # found and waited for before the socket is closed
+        task = Task(coro)
+        self.loop.start_task(task, eager=True)
+        try:
+            return await task
+        except BaseException:
+            await self.discard_worker(worker, task)
+            raise
+
+    def release_worker(self, worker: WorkerProcess) -> None:
+        worker.idle_since = monotonic()
+        self.idle_workers.append(worker)
+
+    async def discard_worker(
+        self, worker: WorkerProcess, task: Task[Any] | None = None
+    ) -> None:
+        self.workers.discard(worker)
+        worker.kill()
+        with CancelScope(shield=True):
+            if task is not None:
+                await _abort_connections(self.loop, {task: worker.sock})
+            else:
+                worker.sock.close()
+
+            # Reap the process without blocking the event loop
+            await run_sync_in_thread(worker.process.wait)
+
+    def shutdown(self) -> None:
+        # The event loop is closing, so just kill the workers all at once and then
+        # reap them
+        self.idle_workers.clear()
+        for worker in self.workers:
+            worker.kill()
+            worker.sock.close()
+
+        for worker in self.workers:
+            worker.process.wait()
+
+        self.workers.clear()
+
+
+async def run_sync(
+    func: Callable[[Unpack[PosArgsT]], T_Retval],
+    *args: Unpack[PosArgsT],
+    limiter: CapacityLimiter | None = None,
+) -> T_Retval:
+    loop = current_event_loop()
+    if limiter is None:
+        limiter = loop.default_process_limiter
+
+    segments: list[SharedMemory] = []
+    try:
+        shared_args = tuple(_share_large_buffer(arg, segments) for arg in args)
+        request = pickle.dumps((func, shared_args), protocol=pickle.HIGHEST_PROTOCOL)
+        del shared_args
+        async with limiter:
+            pool = loop.process_pool
+            worker = await pool.acquire_worker()
+            exchange = _exchange(worker.sock, request)
+            del request
+            response = await pool.communicate(worker, exchange)
+            pool.release_worker(worker)
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    status, value = pickle.loads(response)
+    if status == "exception":
+        raise value
+
+    return value
+
+
+def current_default_process_limiter() -> CapacityLimiter:
+    return current_event_loop().default_process_limiter
+
+
+def process_worker() -> None:
+    # This is the entry point of the worker processes
+    sock = socket.socket(fileno=int(sys.argv[1]))
+
+    def receive_message() -> bytes:
+        (length,) = header.unpack(_receive_exactly_blocking(sock, header.size))
+        return _receive_exactly_blocking(sock, length)
+
+    # Set up the module search path and the __main__ module like the parent has them
+    try:
+        sys.path, main_path = pickle.loads(receive_message())
+    except EOFError:
+        return
+
+    if main_path:
+        # Load the parent's main module as __mp_main__ (like multiprocessing does) so
+        # that it won't run the code under the "if __name__ == '__main__':" guard
+        main_module = ModuleType("__mp_main__")
+        main_module.__dict__.update(run_path(main_path, run_name="__mp_main__"))
+        sys.modules["__main__"] = sys.modules["__mp_main__"] = main_module
+
+    while True:
+        try:
+            func, args = pickle.loads(receive_message())
+        except EOFError:
+            return
+
+        mappings: list[mmap.mmap] = []
+        try:
+            args = tuple(_attach_shared_buffer(arg, mappings) for arg in args)
+            response: tuple[str, Any] = ("return", func(*args))
+        except BaseException as exc:
+            response = ("exception", exc)
+
+        del func, args
+        for mapping in mappings:
+            try:
+                mapping.close()
+            except BufferError:
+                pass  # the function kept a reference to the memory view
+
+        try:
+            payload = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException as exc:
+            payload = pickle.dumps(
+                ("exception", RuntimeError(f"error pickling the return value: {exc!r}"))
+            )
+
+        del response
+        sock.sendall(header.pack(len(payload)) + payload)
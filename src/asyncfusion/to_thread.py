@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Sequence
+from contextvars import Context, copy_context
+from functools import partial
+from queue import SimpleQueue
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+from ._eventloop import current_event_loop
+from ._exceptions import WouldBlock
+from ._futures import Future
+from ._tasks import CancelScope
+from ._utils import current_async_library_cvar
+
+if sys.version_info >= (3, 11):
+    from typing import TypeVarTuple, Unpack
+else:
+    from typing_extensions import TypeVarTuple, Unpack
+
+if TYPE_CHECKING:
+    from ._eventloop import EventLoop
+    from ._synchronization import CapacityLimiter
+
+T_Retval = TypeVar("T_Retval")
+PosArgsT = TypeVarTuple("PosArgsT")
+
+DEFAULT_THREAD_LIMIT = 40
+# How many jobs may wait for a free worker thread before submit() refuses more
+DEFAULT_QUEUE_LIMIT = 1000
+MAX_IDLE_TIME = 10  # seconds an idle worker thread is kept around for reuse
+
+
+class Job(NamedTuple):
+    func: Callable[..., Any]
+    args: Sequence[Any]
+    context: Context | None
+    thread_name: str | None
+    future: Future[Any]
+
+
+def _set_result(future: Future[T_Retval], result: T_Retval) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: Future[Any], exception: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exception)
+
+
+class WorkerThread(threading.Thread):
+    def __init__(self, pool: WorkerThreadPool):
+        super().__init__(name="asyncfusion worker thread", daemon=True)
+        self.pool = pool
+        self.queue: SimpleQueue[Job | None] = SimpleQueue()
+        self.idle_since = monotonic()
+
+    def run(self) -> None:
+        pool = self.pool
+        job = self.queue.get()
+        while job is not None:
+            if job.thread_name is not None:
+                self.name = job.thread_name
+
+            try:
+                if job.context is not None:
+                    result = job.context.run(job.func, *job.args)
+                else:
+                    result = job.func(*job.args)
+            except BaseException as exc:
+                callback = partial(_set_exception, job.future, exc)
+            else:
+                callback = partial(_set_result, job.future, result)
+
+            if job.thread_name is not None:
+                self.name = "asyncfusion worker thread"
+
+            # Take the next queued job, or go idle before delivering the outcome so that
+            # this worker can be reused for the job that the outcome may lead to
+            next_job: Job | None = None
+            with pool.lock:
+                if pool.closed:
+                    return
+                elif pool.pending_jobs:
+                    next_job = pool.pending_jobs.popleft()
+                    if pool.room_waiters:
+                        # Let a task that is waiting for room in the queue submit
+                        waiter = pool.room_waiters.popleft()
+                        pool.loop.call_soon_threadsafe(
+                            partial(_set_result, waiter, None)
+                        )
+                else:
+                    self.idle_since = monotonic()
+                    pool.idle_workers.append(self)
+
+                # Deliver the outcome through the event loop's wakeup mechanism (there
+                # is no need for a separate pipe for each call). This is done while
+                # holding the lock, as the pool is shut down before the loop closes its
+                # ring, and the wakeup file descriptor with it.
+                pool.loop.call_soon_threadsafe(callback)
+
+            del job, callback
+            if next_job is not None:
+                job = next_job
+                continue
+
+            job = self.queue.get()
+
+
+class WorkerThreadPool:
+    def __init__(
+        self,
+        loop: EventLoop,
+        max_workers: int = DEFAULT_THREAD_LIMIT,
+        max_pending_jobs: int = DEFAULT_QUEUE_LIMIT,
+    ):
+        self.loop = loop
+        self.max_workers = max_workers
+        self.max_pending_jobs = max_pending_jobs
+        self.lock = threading.Lock()
+        self.closed = False
+        self.workers: set[WorkerThread] = set()
+        self.idle_workers: deque[WorkerThread] = deque()
+        self.pending_jobs: deque[Job] = deque()
+        # Completed when a worker takes a job off the full queue
+        self.room_waiters: deque[Future[None]] = deque()
+
+    def submit(
+        self,
+        func: Callable[[Unpack[PosArgsT]], T_Retval],
+        args: tuple[Unpack[PosArgsT]],
+        *,
+        context: Context | None = None,
+        thread_name: str | None = None,
+    ) -> Future[T_Retval]:
+        if self.closed:
+            raise RuntimeError("this thread pool has been shut down")
+
+        future: Future[T_Retval] = Future()
+        job = Job(func, args, context, thread_name, future)
+        with self.lock:
+            # Stop the workers that have been idle for too long (the oldest ones are
+            # on the left)
+            expiry_time = monotonic() - MAX_IDLE_TIME
+            while self.idle_workers and self.idle_workers[0].idle_since < expiry_time:
+                expired_worker = self.idle_workers.popleft()
+                expired_worker.queue.put(None)
+                self.workers.discard(expired_worker)
+
+            # Reuse the most recently idled worker, or queue the job if the pool is full
+            if self.idle_workers:
+                worker: WorkerThread | None = self.idle_workers.pop()
+            elif len(self.workers) < self.max_workers:
+                worker = None
+            elif len(self.pending_jobs) >= self.max_pending_jobs:
+                raise WouldBlock
+            else:
+                self.pending_jobs.append(job)
+                return future
+
+        if worker is None:
+            worker = WorkerThread(self)
+            worker.start()
+            self.workers.add(worker)
+
+        worker.queue.put(job)
+        return future
+
+    async def submit_when_ready(
+        self,
+        func: Callable[[Unpack[PosArgsT]], T_Retval],
+        args: tuple[Unpack[PosArgsT]],
+        *,
+        context: Context | None = None,
+        thread_name: str | None = None,
+    ) -> Future[T_Retval]:
+        # Like submit(), but waits for room in the queue if it's full
+        while True:
+            try:
+                return self.submit(func, args, context=context, thread_name=thread_name)
+            except WouldBlock:
+                pass
+
+            waiter: Future[None] = Future()
+            with self.lock:
+                if len(self.pending_jobs) < self.max_pending_jobs:
+                    continue
+
+                self.room_waiters.append(waiter)
+
+            try:
+                await waiter
+            except BaseException:
+                with self.lock:
+                    if waiter in self.room_waiters:
+                        self.room_waiters.remove(waiter)
+
+                raise
+
+    def shutdown(self) -> None:
+        with self.lock:
+            self.closed = True
+            self.pending_jobs.clear()
+            self.idle_workers.clear()
+            for worker in self.workers:
+                worker.queue.put(None)
+
+            self.workers.clear()
+
+
+async def run_sync(
+    func: Callable[[Unpack[PosArgsT]], T_Retval],
+    *args: Unpack[PosArgsT],
+    thread_name: str | None = None,
+    abandon_on_cancel: bool = False,
+    limiter: CapacityLimiter | None = None,
+) -> T_Retval:
+    loop = current_event_loop()
+    if limiter is None:
+        limiter = loop.default_thread_limiter
+
+    # No async library is running in the worker thread, as far as sniffio is concerned
+    context = copy_context()
+    context.run(current_async_library_cvar.set, None)
+    async with limiter:
+        future = await loop.thread_pool.submit_when_ready(
+            func, args, context=context, thread_name=thread_name
+        )
+        if abandon_on_cancel:
+            return await future
+
+        # The thread can't be interrupted, so keep waiting for it (and holding the
+        # limiter token) until it's done; a cancellation takes effect at the next
+        # checkpoint after that
+        with CancelScope(shield=True):
+            return await future
+
+
+def current_default_thread_limiter() -> CapacityLimiter:
+    return current_event_loop().default_thread_limiter
@@ -13,18 +13,18 @@
 #include <liburing.h>
 #include <arpa/inet.h>
 #include <sys/un.h>
+#include <sys/eventfd.h>
+#include <errno.h>
 #include <poll.h>
+#include <time.h>
+#include <unistd.h>
 #define Py_LIMITED_API PYTHON_API_VERSION
 
-typedef struct {
-    PyObject_HEAD
-    struct io_uring ring;
-} IoUringObject;
-
 enum RequestType {
     ACCEPT,
     CLOSE,
     CONNECT,
+    MSG_RING,
     POLL,
     RECV,
     RECV_INTO,
@@ -32,7 +32,8 @@ enum RequestType {
     RECVFROM_INTO,
     SEND,
     SENDTO,
-    SLEEP
+    SLEEP,
+    WAKEUP
 };
 
 struct accept_operation {
@@ -70,6 +71,10 @@ struct recvfrom_into_operation {
     socklen_t addrlen;
 };
 
+struct send_operation {
+    Py_buffer buf;
+};
+
 struct sendto_operation {
     struct sockaddr_storage to_addr;
 };
@@ -88,12 +93,86 @@ struct request {
         struct recv_into_operation recv_into;
         struct recvfrom_operation recvfrom;
         struct recvfrom_into_operation recvfrom_into;
+        struct send_operation send;
         struct sendto_operation sendto;
         struct sleep_operation sleep;
     };
 };
 
+typedef struct {
+    PyObject_HEAD
+    struct io_uring ring;
+    int wakeup_fd;
+    eventfd_t wakeup_value;
+    struct request wakeup_req;
+    // Busy polling: the longest allowed spin (0 = disabled), the current auto-tuned
+    // spin window and the moving average of how long the ring has stayed idle
+    uint64_t busy_poll_max_ns;
+    uint64_t busy_poll_window_ns;
+    uint64_t avg_idle_ns;
+    // How many spins go by between checks of the clock (and, when completions need
+    // it, entries into the kernel to fetch them)
+    unsigned busy_poll_check_interval;
+    // Busy polling statistics
+    uint64_t spin_ns;
+    uint64_t spin_hits;
+    uint64_t spin_misses;
+    // The setup flags the ring was actually created with, and the kernel's features
+    unsigned setup_flags;
+    unsigned ring_features;
+} IoUringObject;
+
+struct flag_name {
+    unsigned flag;
+    const char *name;
+};
+
+static const struct flag_name setup_flag_names[] = {
+    {IORING_SETUP_ATTACH_WQ, "ATTACH_WQ"},
+#ifdef IORING_SETUP_COOP_TASKRUN
+    {IORING_SETUP_COOP_TASKRUN, "COOP_TASKRUN"},
+    {IORING_SETUP_TASKRUN_FLAG, "TASKRUN_FLAG"},
+#endif
+#ifdef IORING_SETUP_DEFER_TASKRUN
+    {IORING_SETUP_SINGLE_ISSUER, "SINGLE_ISSUER"},
+    {IORING_SETUP_DEFER_TASKRUN, "DEFER_TASKRUN"},
+#endif
+    {0, NULL}
+};
+
+static const struct flag_name ring_feature_names[] = {
+    {IORING_FEAT_SINGLE_MMAP, "SINGLE_MMAP"},
+    {IORING_FEAT_NODROP, "NODROP"},
+    {IORING_FEAT_SUBMIT_STABLE, "SUBMIT_STABLE"},
+    {IORING_FEAT_FAST_POLL, "FAST_POLL"},
+    {IORING_FEAT_EXT_ARG, "EXT_ARG"},
+    {IORING_FEAT_NATIVE_WORKERS, "NATIVE_WORKERS"},
+#ifdef IORING_FEAT_CQE_SKIP
+    {IORING_FEAT_CQE_SKIP, "CQE_SKIP"},
+#endif
+    {0, NULL}
+};
+
+// The operations the event loop uses (or could use), for the feature report
+static const struct flag_name probed_opcodes[] = {
+    {IORING_OP_ACCEPT, "ACCEPT"},
+    {IORING_OP_ASYNC_CANCEL, "ASYNC_CANCEL"},
+    {IORING_OP_CLOSE, "CLOSE"},
+    {IORING_OP_CONNECT, "CONNECT"},
+    {IORING_OP_MSG_RING, "MSG_RING"},
+    {IORING_OP_POLL_ADD, "POLL_ADD"},
+    {IORING_OP_RECV, "RECV"},
+    {IORING_OP_SEND, "SEND"},
+    {IORING_OP_SEND_ZC, "SEND_ZC"},
+    {IORING_OP_TIMEOUT, "TIMEOUT"},
+    {0, NULL}
+};
+
 static PyObject *FutureType;
+// Subclass of Future for the futures of ring operations, with a C level field holding
+// the pending request (NULL once the operation is over), for cancelling the operation
+static PyTypeObject *RingFutureType;
+static Py_ssize_t ring_future_request_offset;
 static PyObject *future_str_set_result;
 static PyObject *future_str_set_exception;
 static PyObject *SocketType;
@@ -102,12 +181,114 @@ static PyObject *SocketType;
  * Helper functions
  **/
 
+static inline struct request **ring_future_request(PyObject *future) {
+    return (struct request **)((char *)future + ring_future_request_offset);
+}
+
 static PyObject *raise_oserror(int error) {
     PyObject *args = Py_BuildValue("is", error, strerror(error));
     PyErr_SetObject(PyExc_OSError, args);
     return NULL;
 }
 
+static uint64_t monotonic_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+static inline void cpu_relax(void) {
+#if defined(__x86_64__) || defined(__i386__)
+    __builtin_ia32_pause();
+#elif defined(__aarch64__)
+    __asm__ __volatile__("yield");
+#endif
+}
+
+static void update_busy_poll_window(IoUringObject *self, uint64_t idle_ns) {
+    // Spin for about twice the typical idle period, but give up spinning altogether
+    // if the ring usually stays idle for much longer than the maximum window
+    self->avg_idle_ns += ((int64_t)idle_ns - (int64_t)self->avg_idle_ns) / 8;
+    if (self->avg_idle_ns > 4 * self->busy_poll_max_ns)
+        self->busy_poll_window_ns = 0;
+    else if (2 * self->avg_idle_ns < self->busy_poll_max_ns)
+        self->busy_poll_window_ns = 2 * self->avg_idle_ns;
+    else
+        self->busy_poll_window_ns = self->busy_poll_max_ns;
+}
+
+static bool completions_need_enter(IoUringObject *self) {
+    // When the kernel defers the completion work (or has flagged that it has some
+    // pending), completions only get posted when the issuer enters the kernel to
+    // ask for them
+#ifdef IORING_SETUP_DEFER_TASKRUN
+    if (self->setup_flags & IORING_SETUP_DEFER_TASKRUN)
+        return true;
+#endif
+#ifdef IORING_SETUP_TASKRUN_FLAG
+    if ((self->setup_flags & IORING_SETUP_TASKRUN_FLAG) &&
+            (IO_URING_READ_ONCE(*self->ring.sq.kflags) & IORING_SQ_TASKRUN))
+        return true;
+#endif
+    return false;
+}
+
+static int submit(IoUringObject *self) {
+    if (completions_need_enter(self))
+        return io_uring_submit_and_get_events(&self->ring);
+
+    return io_uring_submit(&self->ring);
+}
+
+static int wait_for_cqe(IoUringObject *self) {
+    // Flush the pending submissions, then spin on the completion queue for a while
+    // before blocking in the kernel, to avoid the wake-up delay when the next
+    // completion arrives soon
+    int ret = submit(self);
+    if (ret < 0 || io_uring_cq_ready(&self->ring))
+        return ret;
+
+    uint64_t start = monotonic_ns();
+    uint64_t now = start;
+    bool ready = false;
+    Py_BEGIN_ALLOW_THREADS
+    if (self->busy_poll_window_ns) {
+        uint64_t deadline = start + self->busy_poll_window_ns;
+        unsigned spins = 0;
+        while (!(ready = io_uring_cq_ready(&self->ring))) {
+            cpu_relax();
+            // Only check the clock every now and then. Normally the kernel posts the
+            // completions by itself, so spinning makes no syscalls at all. With
+            // DEFER_TASKRUN, it only posts them when this thread enters the kernel, so
+            // each check costs a syscall too: a longer interval spins more cheaply, but
+            // notices a completion up to that many spins later.
+            if (++spins % self->busy_poll_check_interval == 0) {
+                if ((now = monotonic_ns()) >= deadline)
+                    break;
+
+                if (completions_need_enter(self))
+                    io_uring_submit_and_get_events(&self->ring);
+            }
+        }
+
+        now = monotonic_ns();
+        self->spin_ns += now - start;
+        if (ready)
+            self->spin_hits++;
+        else
+            self->spin_misses++;
+    }
+
+    if (!ready) {
+        ret = io_uring_submit_and_wait(&self->ring, 1);
+        now = monotonic_ns();
+    }
+    Py_END_ALLOW_THREADS
+
+    update_busy_poll_window(self, now - start);
+    return ret;
+}
+
 static struct io_uring_sqe *get_new_sqe(struct io_uring *ring, struct request *req) {
     struct io_uring_sqe *sqe = io_uring_get_sqe(ring);
     if (!sqe) {
@@ -127,6 +308,8 @@ static struct io_uring_sqe *get_new_sqe(struct io_uring *ring, struct request *r
     return sqe;
 };
 
+static void free_request(struct request *req);
+
 static struct request *create_request(
     enum RequestType type,
     struct io_uring *ring,
@@ -142,24 +325,29 @@ static struct request *create_request(
     // Set the request type
     req->type = type;
 
-    // Create a Future
-    req->future = PyObject_CallNoArgs(FutureType);
+    // Create a Future, and let it know its request so the operation can be cancelled
+    // through it
+    req->future = PyObject_CallNoArgs((PyObject *)RingFutureType);
     if (!req->future) {
         PyMem_Free(req);
         return NULL;
     }
 
+    *ring_future_request(req->future) = req;
     if (sqe) {
         // Create the submission queue entry and set the request as its data
         *sqe = get_new_sqe(ring, req);
-        if (!*sqe)
+        if (!*sqe) {
+            free_request(req);
             return NULL;
+        }
     }
 
     return req;
 }
 
 static void free_request(struct request *req) {
+    *ring_future_request(req->future) = NULL;
     Py_DECREF(req->future);
     switch (req->type) {
         case RECV:
@@ -178,6 +366,9 @@ static void free_request(struct request *req) {
         case RECVFROM_INTO:
             PyBuffer_Release(&req->recvfrom_into.buf);
             break;
+        case SEND:
+            PyBuffer_Release(&req->send.buf);
+            break;
         default:
             break;
     }
@@ -322,11 +513,30 @@ static PyObject *build_pyobject_from_sockaddr(struct sockaddr_storage *addr) {
     }
 }
 
-static int handle_cqe(struct io_uring_cqe *cqe) {
+static int arm_wakeup(IoUringObject *self) {
+    // Wait for the wakeup eventfd to be written to (from any thread)
+    struct io_uring_sqe *sqe = get_new_sqe(&self->ring, &self->wakeup_req);
+    if (!sqe)
+        return 0;
+
+    io_uring_prep_read(sqe, self->wakeup_fd, &self->wakeup_value, sizeof(eventfd_t), 0);
+    return 1;
+}
+
+static int handle_cqe(IoUringObject *self, struct io_uring_cqe *cqe) {
     // Handle a completion queue event
     PyObject *result = NULL;
     struct request *req = (struct request *)io_uring_cqe_get_data(cqe);
 
+    // A message posted by another ring (IORING_OP_MSG_RING) carries no request; it
+    // only serves to wake up the event loop
+    if (!req)
+        return 1;
+
+    // The wakeup eventfd was written to, so wait for the next write
+    if (req->type == WAKEUP)
+        return arm_wakeup(self);
+
     // Special case SLEEP, as it always sets errno to -62
     if (req->type == SLEEP && cqe->res == -62)
         cqe->res = 0;
@@ -416,16 +626,165 @@ error:
  * IoUringObject methods
  **/
 
+static PyObject *asyncfusion_uring_cancel_futures(IoUringObject *self, PyObject *args) {
+    PyObject *futures;
+    if (!PyArg_ParseTuple(args, "O:cancel_futures", &futures))
+        return NULL;
+
+    PyObject *iterator = PyObject_GetIter(futures);
+    if (!iterator)
+        return NULL;
+
+    // Queue a cancellation for the operation of each future; they all get submitted
+    // together on the next poll
+    long count = 0;
+    PyObject *future;
+    while ((future = PyIter_Next(iterator))) {
+        // Skip futures that were not created by the ring, and the ones whose operation
+        // is already over
+        struct request *req = NULL;
+        if (Py_TYPE(future) == RingFutureType)
+            req = *ring_future_request(future);
+
+        Py_DECREF(future);
+        if (!req)
+            continue;
+
+        // The completion of the cancel operation itself is ignored (NULL user data)
+        struct io_uring_sqe *sqe = get_new_sqe(&self->ring, NULL);
+        if (!sqe)
+            break;
+
+        io_uring_prep_cancel64(sqe, (__u64)(uintptr_t)req, 0);
+        io_uring_sqe_set_data(sqe, NULL);
+        count++;
+    }
+
+    Py_DECREF(iterator);
+    if (PyErr_Occurred())
+        return NULL;
+
+    return PyLong_FromLong(count);
+}
+
 static PyObject *asyncfusion_uring_close(IoUringObject *self) {
+    // The wakeup file descriptor doubles as the "ring is open" flag
+    if (self->wakeup_fd < 0)
+        Py_RETURN_NONE;
+
     io_uring_queue_exit(&self->ring);
+    close(self->wakeup_fd);
+    self->wakeup_fd = -1;
     Py_RETURN_NONE;
 }
 
-static PyObject *asyncfusion_uring_init(IoUringObject *self) {
-    int ret;
+static PyObject *asyncfusion_uring_fileno(IoUringObject *self) {
+    return PyLong_FromLong(self->ring.ring_fd);
+}
+
+static int init_ring(IoUringObject *self, int wq_fd, unsigned flags) {
+    // Share the kernel worker pool (io-wq) of another ring if one was given
+    struct io_uring_params params;
+    memset(&params, 0, sizeof(params));
+    params.flags = flags;
+    if (wq_fd >= 0) {
+        params.flags |= IORING_SETUP_ATTACH_WQ;
+        params.wq_fd = wq_fd;
+    }
+
+    int ret = io_uring_queue_init_params(100, &self->ring, &params);
+    if (ret == 0) {
+        self->setup_flags = params.flags;
+        self->ring_features = params.features;
+    }
+
+    return ret;
+}
+
+static PyObject *asyncfusion_uring_init(IoUringObject *self, PyObject *args) {
+    int wq_fd = -1;
+    const char *mode = "auto";
+    if (!PyArg_ParseTuple(args, "|is:init", &wq_fd, &mode))
+        return NULL;
+
+    bool auto_mode = strcmp(mode, "auto") == 0;
+    bool defer_mode = strcmp(mode, "defer_taskrun") == 0;
+    bool coop_mode = strcmp(mode, "coop_taskrun") == 0;
+    bool default_mode = strcmp(mode, "default") == 0;
+    if (!(auto_mode || defer_mode || coop_mode || default_mode)) {
+        PyErr_Format(PyExc_ValueError, "invalid ring mode: %s", mode);
+        return NULL;
+    }
+
+    // The event loop only ever submits from the thread that runs it, so the kernel
+    // can run the completion work when the loop asks for completions, instead of
+    // interrupting it whenever an operation finishes. "auto" picks the best mode the
+    // kernel supports (unsupported setup flags are rejected with EINVAL).
+    int ret = -EINVAL;
+#ifdef IORING_SETUP_DEFER_TASKRUN
+    if (auto_mode || defer_mode)
+        ret = init_ring(
+            self, wq_fd, IORING_SETUP_SINGLE_ISSUER | IORING_SETUP_DEFER_TASKRUN
+        );
+#endif
+#ifdef IORING_SETUP_COOP_TASKRUN
+    if ((auto_mode && ret == -EINVAL) || coop_mode)
+        ret = init_ring(
+            self, wq_fd, IORING_SETUP_COOP_TASKRUN | IORING_SETUP_TASKRUN_FLAG
+        );
+#endif
+    if ((auto_mode && ret == -EINVAL) || default_mode)
+        ret = init_ring(self, wq_fd, 0);
 
-    ret = io_uring_queue_init(100, &self->ring, 0);
     if (ret < 0)
+        return raise_oserror(-ret);
+
+    // Create the eventfd used to wake up the event loop from other threads
+    self->wakeup_fd = eventfd(0, EFD_CLOEXEC);
+    if (self->wakeup_fd < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        io_uring_queue_exit(&self->ring);
+        return NULL;
+    }
+
+    self->wakeup_req.type = WAKEUP;
+    if (!arm_wakeup(self)) {
+        close(self->wakeup_fd);
+        self->wakeup_fd = -1;
+        io_uring_queue_exit(&self->ring);
+        return NULL;
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyObject *asyncfusion_uring_msg_ring(IoUringObject *self, PyObject *args) {
+    int ring_fd;
+    if (!PyArg_ParseTuple(args, "i:msg_ring", &ring_fd))
+        return NULL;
+
+    // Create the request and the submission queue entry
+    struct io_uring_sqe *sqe;
+    struct request *req = create_request(MSG_RING, &self->ring, &sqe);
+    if (!req)
+        return NULL;
+
+    // Post an empty completion (with no user data) to the target ring
+    io_uring_prep_msg_ring(sqe, ring_fd, 0, 0, 0);
+
+    Py_INCREF(req->future);
+    return req->future;
+}
+
+static PyObject *asyncfusion_uring_wake(IoUringObject *self) {
+    // This is safe to call from any thread, as long as the ring isn't being closed at
+    // the same time
+    if (self->wakeup_fd < 0) {
+        PyErr_SetString(PyExc_RuntimeError, "the ring has been closed");
+        return NULL;
+    }
+
+    if (eventfd_write(self->wakeup_fd, 1) < 0)
         return PyErr_SetFromErrno(PyExc_OSError);
 
     Py_RETURN_NONE;
@@ -438,10 +797,24 @@ static PyObject *asyncfusion_uring_poll(IoUringObject *self, PyObject *args) {
 
     // Flush any pending submissions, optionally also waiting for at least one CQE
     int ret;
-    if (wait)
+    if (wait && self->busy_poll_max_ns) {
+        ret = wait_for_cqe(self);
+    } else if (wait) {
+        Py_BEGIN_ALLOW_THREADS
         ret = io_uring_submit_and_wait(&self->ring, 1);
-    else
-        ret = io_uring_submit(&self->ring);
+        Py_END_ALLOW_THREADS
+    } else {
+        ret = submit(self);
+    }
+
+    if (ret == -EINTR) {
+        // A signal interrupted the wait: run the Python signal handlers, then carry
+        // on like after any other wake-up
+        if (PyErr_CheckSignals() < 0)
+            return NULL;
+
+        ret = 0;
+    }
 
     if (ret < 0)
         return raise_oserror(-ret);
@@ -452,7 +825,7 @@ static PyObject *asyncfusion_uring_poll(IoUringObject *self, PyObject *args) {
     struct io_uring_cqe *cqe;
     io_uring_for_each_cqe(&self->ring, head, cqe) {
         cqes_seen++;
-        if (!handle_cqe(cqe)) {
+        if (!handle_cqe(self, cqe)) {
             io_uring_cq_advance(&self->ring, cqes_seen);
             return NULL;
         }
@@ -462,6 +835,106 @@ static PyObject *asyncfusion_uring_poll(IoUringObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+static PyObject *asyncfusion_uring_set_busy_poll(IoUringObject *self, PyObject *args) {
+    double max_seconds;
+    unsigned check_interval = 64;
+    if (!PyArg_ParseTuple(args, "d|I:set_busy_poll", &max_seconds, &check_interval))
+        return NULL;
+
+    if (max_seconds < 0) {
+        PyErr_SetString(PyExc_ValueError, "the busy poll window cannot be negative");
+        return NULL;
+    }
+
+    if (check_interval < 1) {
+        PyErr_SetString(PyExc_ValueError, "the busy poll check interval must be positive");
+        return NULL;
+    }
+
+    // Spinning only delays the completion on a uniprocessor system, so leave busy
+    // polling disabled there
+    if (sysconf(_SC_NPROCESSORS_ONLN) < 2)
+        max_seconds = 0;
+
+    // Start from the full window and let it adapt to the actual idle periods
+    self->busy_poll_max_ns = (uint64_t)(max_seconds * 1e9);
+    self->busy_poll_window_ns = self->busy_poll_max_ns;
+    self->busy_poll_check_interval = check_interval;
+    self->avg_idle_ns = 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject *flag_names_to_list(const struct flag_name *names, unsigned flags) {
+    PyObject *list = PyList_New(0);
+    if (!list)
+        return NULL;
+
+    for (const struct flag_name *entry = names; entry->name; entry++) {
+        if (!(flags & entry->flag))
+            continue;
+
+        PyObject *name = PyUnicode_FromString(entry->name);
+        if (!name || PyList_Append(list, name) < 0) {
+            Py_XDECREF(name);
+            Py_DECREF(list);
+            return NULL;
+        }
+
+        Py_DECREF(name);
+    }
+
+    return list;
+}
+
+static PyObject *asyncfusion_uring_features(IoUringObject *self) {
+    // Report the setup flags and features of the ring, and which of the relevant
+    // operations the kernel supports
+    PyObject *setup_flags = flag_names_to_list(setup_flag_names, self->setup_flags);
+    PyObject *features = flag_names_to_list(ring_feature_names, self->ring_features);
+    PyObject *opcodes = PyDict_New();
+    if (!setup_flags || !features || !opcodes)
+        goto error;
+
+    struct io_uring_probe *probe = io_uring_get_probe();
+    for (const struct flag_name *entry = probed_opcodes; entry->name; entry++) {
+        PyObject *supported = PyBool_FromLong(
+            probe && io_uring_opcode_supported(probe, entry->flag)
+        );
+        if (PyDict_SetItemString(opcodes, entry->name, supported) < 0) {
+            Py_DECREF(supported);
+            io_uring_free_probe(probe);
+            goto error;
+        }
+
+        Py_DECREF(supported);
+    }
+
+    if (probe)
+        io_uring_free_probe(probe);
+
+    PyObject *result = Py_BuildValue(
+        "{s:N,s:N,s:N}", "setup_flags", setup_flags, "features", features, "opcodes",
+        opcodes
+    );
+    return result;
+
+error:
+    Py_XDECREF(setup_flags);
+    Py_XDECREF(features);
+    Py_XDECREF(opcodes);
+    return NULL;
+}
+
+static PyObject *asyncfusion_uring_busy_poll_stats(IoUringObject *self) {
+    // (time spent spinning, spins that saw a completion, spins that had to block,
+    // current spin window, maximum spin window)
+    return Py_BuildValue(
+        "dKKdd", self->spin_ns / 1e9, (unsigned long long)self->spin_hits,
+        (unsigned long long)self->spin_misses, self->busy_poll_window_ns / 1e9,
+        self->busy_poll_max_ns / 1e9
+    );
+}
+
 static PyObject *asyncfusion_uring_sock_accept(IoUringObject *self, PyObject *args) {
     int sockfd;
     if (!PyArg_ParseTuple(args, "i:sock_accept", &sockfd))
@@ -572,6 +1045,35 @@ static PyObject *asyncfusion_uring_sock_recv(IoUringObject *self, PyObject *args
     return req->future;
 }
 
+static PyObject *asyncfusion_uring_sock_try_recv(IoUringObject *self, PyObject *args) {
+    int sockfd;
+    ssize_t length;
+    int flags = 0;
+    if (!PyArg_ParseTuple(args, "in|i:sock_try_recv", &sockfd, &length, &flags))
+        return NULL;
+
+    // Receive straight into a bytes object, and shrink it to what was received
+    PyObject *result = PyBytes_FromStringAndSize(NULL, length);
+    if (!result)
+        return NULL;
+
+    // Attempt a non-blocking recv() directly, bypassing the ring
+    ssize_t received = recv(sockfd, PyBytes_AsString(result), length, flags | MSG_DONTWAIT);
+    if (received < 0) {
+        int error = errno;
+        Py_DECREF(result);
+        if (error == EAGAIN || error == EWOULDBLOCK)
+            Py_RETURN_NONE;
+
+        return raise_oserror(error);
+    }
+
+    if (received < length && _PyBytes_Resize(&result, received) < 0)
+        return NULL;
+
+    return result;
+}
+
 static PyObject *asyncfusion_uring_sock_recv_into(IoUringObject *self, PyObject *args) {
     // Create the request (without a SQE)
     struct request *req = create_request(RECV_INTO, &self->ring, NULL);
@@ -664,25 +1166,51 @@ error:
 
 static PyObject *asyncfusion_uring_sock_send(IoUringObject *self, PyObject *args) {
     int sockfd;
-    char *buffer;
-    Py_ssize_t length;
+    Py_buffer buffer;
     int flags = 0;
-    if (!PyArg_ParseTuple(args, "iy#|i:sock_send", &sockfd, &buffer, &length, &flags))
+    if (!PyArg_ParseTuple(args, "iy*|i:sock_send", &sockfd, &buffer, &flags))
         return NULL;
 
     // Create the request and the submission queue entry
     struct io_uring_sqe *sqe;
     struct request *req = create_request(SEND, &self->ring, &sqe);
-    if (!req)
+    if (!req) {
+        PyBuffer_Release(&buffer);
         return NULL;
+    }
+
+    // Keep the buffer alive until the operation completes
+    req->send.buf = buffer;
 
     // Prepare the send() operation and attach the future to the SQE
-    io_uring_prep_send(sqe, sockfd, buffer, length, flags);
+    io_uring_prep_send(sqe, sockfd, buffer.buf, buffer.len, flags);
 
     Py_INCREF(req->future);
     return req->future;
 }
 
+static PyObject *asyncfusion_uring_sock_try_send(IoUringObject *self, PyObject *args) {
+    int sockfd;
+    Py_buffer buffer;
+    int flags = 0;
+    if (!PyArg_ParseTuple(args, "iy*|i:sock_try_send", &sockfd, &buffer, &flags))
+        return NULL;
+
+    // Attempt a non-blocking send() directly, bypassing the ring
+    ssize_t sent = send(sockfd, buffer.buf, buffer.len, flags | MSG_DONTWAIT);
+    // Save errno before releasing the buffer, which may run code that changes it
+    int error = errno;
+    PyBuffer_Release(&buffer);
+    if (sent < 0) {
+        if (error == EAGAIN || error == EWOULDBLOCK)
+            Py_RETURN_NONE;
+
+        return raise_oserror(error);
+    }
+
+    return PyLong_FromSsize_t(sent);
+}
+
 static PyObject *asyncfusion_uring_sock_sendto(IoUringObject *self, PyObject *args) {
     int sockfd;
     char *buffer;
@@ -783,9 +1311,15 @@ static PyObject *asyncfusion_uring_sleep(IoUringObject *self, PyObject *args) {
 }
 
 static PyMethodDef IoUringMethods[] = {
+    {"busy_poll_stats", (PyCFunction)asyncfusion_uring_busy_poll_stats, METH_NOARGS, "Return the busy polling statistics"},
+    {"cancel_futures", (PyCFunction)asyncfusion_uring_cancel_futures, METH_VARARGS, "Cancel the operations of the given futures"},
     {"close", (PyCFunction)asyncfusion_uring_close, METH_NOARGS, "Close io_uring"},
-    {"init", (PyCFunction)asyncfusion_uring_init, METH_NOARGS, "Initialize io_uring"},
+    {"features", (PyCFunction)asyncfusion_uring_features, METH_NOARGS, "Report the ring's setup flags, features and supported operations"},
+    {"fileno", (PyCFunction)asyncfusion_uring_fileno, METH_NOARGS, "Return the file descriptor of the ring"},
+    {"init", (PyCFunction)asyncfusion_uring_init, METH_VARARGS, "Initialize io_uring"},
+    {"msg_ring", (PyCFunction)asyncfusion_uring_msg_ring, METH_VARARGS, "Wake up the event loop of another ring"},
     {"poll", (PyCFunction)asyncfusion_uring_poll, METH_VARARGS, "Poll for io_uring completions"},
+    {"set_busy_poll", (PyCFunction)asyncfusion_uring_set_busy_poll, METH_VARARGS, "Set the maximum time to spin on the completion queue before blocking, and how often to check the clock while spinning"},
     {"sleep", (PyCFunction)asyncfusion_uring_sleep, METH_VARARGS, "Sleep for the specified amount of seconds"},
     {"sock_accept", (PyCFunction)asyncfusion_uring_sock_accept, METH_VARARGS, "Accept an incoming connection"},
     {"sock_close", (PyCFunction)asyncfusion_uring_sock_close, METH_VARARGS, "Close a socket"},
@@ -796,11 +1330,24 @@ static PyMethodDef IoUringMethods[] = {
     {"sock_recvfrom_into", (PyCFunction)asyncfusion_uring_sock_recvfrom_into, METH_VARARGS, "Receive data and the source address from a socket into a pre-allocated buffer"},
     {"sock_send", (PyCFunction)asyncfusion_uring_sock_send, METH_VARARGS, "Send data to a socket"},
     {"sock_sendto", (PyCFunction)asyncfusion_uring_sock_sendto, METH_VARARGS, "Send data to the given address through a socket"},
+    {"sock_try_recv", (PyCFunction)asyncfusion_uring_sock_try_recv, METH_VARARGS, "Receive data from a socket without blocking, or return None"},
+    {"sock_try_send", (PyCFunction)asyncfusion_uring_sock_try_send, METH_VARARGS, "Send data to a socket without blocking, or return None"},
     {"sock_wait_readable", (PyCFunction)asyncfusion_uring_sock_wait_readable, METH_VARARGS, "Wait until a socket has data to read"},
     {"sock_wait_writable", (PyCFunction)asyncfusion_uring_sock_wait_writable, METH_VARARGS, "Wait until a socket can be written to"},
+    {"wake", (PyCFunction)asyncfusion_uring_wake, METH_NOARGS, "Wake up the event loop (thread safe)"},
     {NULL, NULL, 0, NULL} // Sentinel
 };
 
+static PyObject *asyncfusion_uring_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    IoUringObject *self = (IoUringObject *)PyType_GenericNew(type, args, kwds);
+    if (!self)
+        return NULL;
+
+    // Not open until init() has been called
+    self->wakeup_fd = -1;
+    return (PyObject *)self;
+}
+
 static PyTypeObject IoUringType = {
     PyVarObject_HEAD_INIT(NULL, 0)
     .tp_name = "io_uring.IoUring",
@@ -808,7 +1355,7 @@ static PyTypeObject IoUringType = {
     .tp_basicsize = sizeof(IoUringObject),
     .tp_itemsize = 0,
     .tp_flags = Py_TPFLAGS_DEFAULT,
-    .tp_new = PyType_GenericNew,
+    .tp_new = asyncfusion_uring_new,
     .tp_methods = IoUringMethods
 };
 
@@ -840,6 +1387,22 @@ PyMODINIT_FUNC PyInit__io_uring(void) {
     if (!FutureType)
         return NULL;
 
+    // Subclass it for the ring's futures, with room for the request pointer after the
+    // fields of the base class
+    ring_future_request_offset = ((PyTypeObject *)FutureType)->tp_basicsize;
+    PyType_Slot ring_future_slots[] = {{0, NULL}};
+    PyType_Spec ring_future_spec = {
+        .name = "asyncfusion._io_uring.RingFuture",
+        .basicsize = (int)(ring_future_request_offset + sizeof(struct request *)),
+        .flags = Py_TPFLAGS_DEFAULT,
+        .slots = ring_future_slots,
+    };
+    RingFutureType = (PyTypeObject *)PyType_FromSpecWithBases(
+        &ring_future_spec, FutureType
+    );
+    if (!RingFutureType)
+        return NULL;
+
     // Import the socket module
     PyObject *socket_module = PyImport_ImportModule("socket");
     if (!socket_module)
@@ -860,5 +1423,10 @@ PyMODINIT_FUNC PyInit__io_uring(void) {
     if (PyModule_AddObject(m, "IoUring", (PyObject *)&IoUringType) < 0)
         return NULL;
 
+    // Add the future class, so Python code can tell the ring's operations apart
+    Py_INCREF(RingFutureType);
+    if (PyModule_AddObject(m, "RingFuture", (PyObject *)RingFutureType) < 0)
+        return NULL;
+
     return m;
 }
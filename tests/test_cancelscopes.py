@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncfusion
+
+
+async def sleep(delay: float) -> None:
+    await asyncfusion.sleep(delay)
+
+
+def test_deadline_cancels_sleep() -> None:
+    async def main() -> tuple[bool, bool, float]:
+        loop = asyncfusion.current_event_loop()
+        start = loop.time_precise()
+        with asyncfusion.CancelScope(deadline=start + 0.05) as scope:
+            await asyncfusion.sleep(3600)
+
+        return scope.cancel_called, scope.cancelled_caught, loop.time_precise() - start
+
+    cancel_called, cancelled_caught, elapsed = asyncfusion.run(main())
+    assert cancel_called
+    assert cancelled_caught
+    assert 0.05 <= elapsed < 1
+
+
+def test_past_deadline_cancels_at_next_checkpoint() -> None:
+    async def main() -> list[str]:
+        events: list[str] = []
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time() - 1):
+            events.append("entered")
+            await asyncfusion.checkpoint()
+            events.append("not reached")
+
+        return events
+
+    assert asyncfusion.run(main()) == ["entered"]
+
+
+def test_cancel_before_expiry() -> None:
+    async def main() -> bool:
+        with asyncfusion.CancelScope() as scope:
+            scope.cancel()
+            await asyncfusion.sleep(3600)
+
+        return scope.cancelled_caught
+
+    assert asyncfusion.run(main())
+
+
+def test_sleep_in_cancelled_scope_leaves_timer_wheel() -> None:
+    async def main() -> int:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope() as scope:
+            scope.cancel()
+            await asyncfusion.sleep(3600)
+
+        return loop._timer_wheel._count
+
+    assert asyncfusion.run(main()) == 0
+
+
+def test_moving_deadline_later() -> None:
+    async def main() -> bool:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time_precise() + 0.01) as scope:
+            scope.deadline = loop.time_precise() + 3600
+            await asyncfusion.sleep(0.05)
+
+        return scope.cancel_called
+
+    assert not asyncfusion.run(main())
+
+
+def test_shield_protects_from_outer_cancellation() -> None:
+    async def main() -> list[str]:
+        events: list[str] = []
+        with asyncfusion.CancelScope() as outer:
+            with asyncfusion.CancelScope(shield=True):
+                outer.cancel()
+                await asyncfusion.sleep(0.01)
+                events.append("shielded sleep finished")
+
+            await asyncfusion.checkpoint()
+            events.append("not reached")
+
+        assert outer.cancelled_caught
+        return events
+
+    assert asyncfusion.run(main()) == ["shielded sleep finished"]
+
+
+def test_outer_deadline_cancels_inner_scope() -> None:
+    async def main() -> tuple[bool, bool]:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time_precise() + 0.01) as outer:
+            with asyncfusion.CancelScope() as inner:
+                await asyncfusion.sleep(3600)
+
+        return outer.cancelled_caught, inner.cancelled_caught
+
+    assert asyncfusion.run(main()) == (True, False)
+
+
+def test_deadline_cancels_task_group_children() -> None:
+    cancelled: list[int] = []
+
+    async def sleeper(index: int) -> None:
+        try:
+            await asyncfusion.sleep(3600)
+        except asyncfusion.CancelledError:
+            cancelled.append(index)
+            raise
+
+    async def main() -> bool:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time_precise() + 0.01) as scope:
+            async with asyncfusion.TaskGroup() as tg:
+                for index in range(3):
+                    tg.create_task(sleeper(index))
+
+        return scope.cancelled_caught
+
+    assert asyncfusion.run(main())
+    assert sorted(cancelled) == [0, 1, 2]
+
+
+def test_cancelled_sleep_leaves_timer_wheel() -> None:
+    async def main() -> tuple[int, int]:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time_precise() + 0.01):
+            await asyncfusion.sleep(3600)
+
+        return loop._timer_wheel._count, len(loop._deadlines)
+
+    assert asyncfusion.run(main()) == (0, 0)
+
+
+def test_cancelled_task_leaves_timer_wheel() -> None:
+    async def main() -> int:
+        loop = asyncfusion.current_event_loop()
+        async with asyncfusion.TaskGroup() as tg:
+            tasks = [tg.create_task(sleep(3600)) for _ in range(100)]
+            await asyncfusion.sleep(0.01)
+            for task in tasks:
+                task.cancel()
+
+        return loop._timer_wheel._count
+
+    assert asyncfusion.run(main()) == 0
+
+
+def test_finished_sleeps_leave_timer_wheel() -> None:
+    async def main() -> int:
+        loop = asyncfusion.current_event_loop()
+        async with asyncfusion.TaskGroup() as tg:
+            for index in range(50):
+                tg.create_task(sleep(index / 1000))
+
+        return loop._timer_wheel._count
+
+    assert asyncfusion.run(main()) == 0
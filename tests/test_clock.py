@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+import asyncfusion
+
+
+def test_mock_clock_autojump() -> None:
+    async def main() -> float:
+        loop = asyncfusion.current_event_loop()
+        start = loop.time()
+        await asyncfusion.sleep(3600)
+        return loop.time() - start
+
+    clock = asyncfusion.MockClock(autojump_threshold=0)
+    real_start = time.monotonic()
+    assert asyncfusion.run(main(), clock=clock) == pytest.approx(3600)
+    assert time.monotonic() - real_start < 5
+
+
+def test_mock_clock_deadline() -> None:
+    async def main() -> tuple[bool, float]:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time() + 60) as scope:
+            await asyncfusion.sleep(3600)
+
+        return scope.cancelled_caught, loop.time()
+
+    clock = asyncfusion.MockClock(autojump_threshold=0)
+    cancelled_caught, end = asyncfusion.run(main(), clock=clock)
+    assert cancelled_caught
+    assert end == pytest.approx(60)
+
+
+def test_mock_clock_jump() -> None:
+    async def main() -> float:
+        clock = asyncfusion.current_event_loop().clock
+        assert isinstance(clock, asyncfusion.MockClock)
+        clock.jump(10)
+        await asyncfusion.sleep(0.01)
+        return asyncfusion.current_time()
+
+    clock = asyncfusion.MockClock(rate=1)
+    assert asyncfusion.run(main(), clock=clock) >= 10.01
+
+
+def test_mock_clock_rate() -> None:
+    async def main() -> float:
+        start = time.monotonic()
+        await asyncfusion.sleep(1)
+        return time.monotonic() - start
+
+    real_elapsed = asyncfusion.run(main(), clock=asyncfusion.MockClock(rate=100))
+    assert real_elapsed < 0.5
+
+
+def test_mock_clock_validation() -> None:
+    with pytest.raises(ValueError):
+        asyncfusion.MockClock(rate=-1)
+
+    with pytest.raises(ValueError):
+        asyncfusion.MockClock(autojump_threshold=-1)
+
+    with pytest.raises(ValueError):
+        asyncfusion.MockClock().jump(-1)
+
+
+def test_cached_time_does_not_run_ahead() -> None:
+    async def main() -> list[tuple[float, float]]:
+        loop = asyncfusion.current_event_loop()
+        samples = []
+        for _ in range(5):
+            samples.append((loop.time(), loop.time_precise()))
+            await asyncfusion.sleep(0.001)
+
+        return samples
+
+    samples = asyncfusion.run(main())
+    assert all(cached <= precise for cached, precise in samples)
+    assert [cached for cached, _ in samples] == sorted(cached for cached, _ in samples)
+
+
+def test_coarse_clock_sleep() -> None:
+    async def main() -> tuple[float, float]:
+        loop = asyncfusion.current_event_loop()
+        start = loop.time_precise()
+        await asyncfusion.sleep(0.05)
+        return loop.time_precise() - start, loop.time()
+
+    elapsed, cached = asyncfusion.EventLoop(coarse_clock=True).run_until_complete(
+        main()
+    )
+    assert 0.05 <= elapsed < 1
+    assert cached > 0
+
+
+def test_system_clock_object() -> None:
+    async def main() -> float:
+        loop = asyncfusion.current_event_loop()
+        assert isinstance(loop.clock, asyncfusion.SystemClock)
+        return loop.clock.current_time() - loop.time_precise()
+
+    assert abs(asyncfusion.run(main())) < 0.1
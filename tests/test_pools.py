@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+
+import asyncfusion
+from asyncfusion._utils import current_async_library_cvar
+from asyncfusion.to_thread import WorkerThreadPool
+
+
+def test_run_sync_in_thread() -> None:
+    async def main() -> tuple[int, str]:
+        return await asyncfusion.to_thread.run_sync(
+            lambda: (threading.get_ident(), threading.current_thread().name),
+            thread_name="custom name",
+        )
+
+    ident, name = asyncfusion.run(main())
+    assert ident != threading.get_ident()
+    assert name == "custom name"
+
+
+def test_run_sync_in_thread_exception() -> None:
+    def fail() -> None:
+        raise KeyError("thread")
+
+    async def main() -> None:
+        await asyncfusion.to_thread.run_sync(fail)
+
+    with pytest.raises(KeyError, match="thread"):
+        asyncfusion.run(main())
+
+
+def test_run_sync_in_thread_clears_async_library() -> None:
+    async def main() -> tuple[str | None, str | None]:
+        in_thread = await asyncfusion.to_thread.run_sync(current_async_library_cvar.get)
+        return in_thread, current_async_library_cvar.get()
+
+    assert asyncfusion.run(main()) == (None, "asyncfusion")
+
+
+def test_run_sync_in_thread_waits_when_cancelled() -> None:
+    finished: list[bool] = []
+
+    def slow() -> None:
+        time.sleep(0.1)
+        finished.append(True)
+
+    async def main() -> None:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time_precise() + 0.01):
+            await asyncfusion.to_thread.run_sync(slow)
+
+    asyncfusion.run(main())
+    assert finished == [True]
+
+
+def test_run_sync_in_thread_abandoned_on_cancel() -> None:
+    release = threading.Event()
+
+    async def main() -> bool:
+        loop = asyncfusion.current_event_loop()
+        with asyncfusion.CancelScope(deadline=loop.time_precise() + 0.01) as scope:
+            await asyncfusion.to_thread.run_sync(release.wait, abandon_on_cancel=True)
+
+        release.set()
+        return scope.cancelled_caught
+
+    assert asyncfusion.run(main())
+
+
+def test_thread_limiter() -> None:
+    running = 0
+    most_running = 0
+    lock = threading.Lock()
+
+    def work() -> None:
+        nonlocal running, most_running
+        with lock:
+            running += 1
+            most_running = max(most_running, running)
+
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    async def main() -> None:
+        limiter = asyncfusion.CapacityLimiter(2)
+        async with asyncfusion.TaskGroup() as tg:
+            for _ in range(6):
+                tg.create_task(asyncfusion.to_thread.run_sync(work, limiter=limiter))
+
+    asyncfusion.run(main())
+    assert most_running == 2
+
+
+def test_thread_pool_queue_limit() -> None:
+    release = threading.Event()
+
+    async def main() -> list[bool]:
+        pool = WorkerThreadPool(
+            asyncfusion.current_event_loop(), max_workers=1, max_pending_jobs=1
+        )
+        try:
+            running = pool.submit(release.wait, ())
+            queued = pool.submit(release.wait, ())
+            with pytest.raises(asyncfusion.WouldBlock):
+                pool.submit(release.wait, ())
+
+            release.set()
+            return [await running, await queued]
+        finally:
+            pool.shutdown()
+
+    assert asyncfusion.run(main()) == [True, True]
+
+
+def test_run_sync_in_process() -> None:
+    async def main() -> tuple[int, int]:
+        pid = await asyncfusion.to_process.run_sync(os.getpid)
+        total = await asyncfusion.to_process.run_sync(sum, [1, 2, 3])
+        return pid, total
+
+    pid, total = asyncfusion.run(main())
+    assert pid != os.getpid()
+    assert total == 6
+
+
+def test_run_sync_in_process_exception() -> None:
+    async def main() -> None:
+        await asyncfusion.to_process.run_sync(int, "not a number")
+
+    with pytest.raises(ValueError, match="not a number"):
+        asyncfusion.run(main())
+
+
+def test_process_worker_reused() -> None:
+    async def main() -> set[int]:
+        return {await asyncfusion.to_process.run_sync(os.getpid) for _ in range(3)}
+
+    assert len(asyncfusion.run(main())) == 1
+
+
+def test_dead_idle_process_worker_replaced() -> None:
+    async def main() -> tuple[int, int]:
+        first = await asyncfusion.to_process.run_sync(os.getpid)
+        pool = asyncfusion.current_event_loop().process_pool
+        for worker in list(pool.idle_workers):
+            worker.process.kill()
+            worker.process.wait()
+
+        second = await asyncfusion.to_process.run_sync(os.getpid)
+        return first, second
+
+    first, second = asyncfusion.run(main())
+    assert first != second
+
+
+def test_loop_pool_spawn() -> None:
+    async def where(value: int) -> tuple[int, str]:
+        await asyncfusion.sleep(0)
+        return value, threading.current_thread().name
+
+    with asyncfusion.LoopPool(2) as pool:
+        results = [pool.spawn(where(index)).result(5) for index in range(4)]
+        sharded = {pool.spawn(where(0), shard="key").result(5)[1] for _ in range(4)}
+
+    assert [value for value, _ in results] == [0, 1, 2, 3]
+    assert {name for _, name in results} == {
+        "asyncfusion-loop-0",
+        "asyncfusion-loop-1",
+    }
+    assert len(sharded) == 1
+
+
+def test_loop_pool_exception() -> None:
+    async def fail() -> None:
+        raise KeyError("pool")
+
+    with asyncfusion.LoopPool(1) as pool:
+        future = pool.spawn(fail())
+        with pytest.raises(KeyError, match="pool"):
+            future.result(5)
+
+
+def test_loop_pool_cancel_running_task() -> None:
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def forever() -> None:
+        started.set()
+        try:
+            await asyncfusion.sleep(3600)
+        except asyncfusion.CancelledError:
+            cancelled.set()
+            raise
+
+    with asyncfusion.LoopPool(1) as pool:
+        future = pool.spawn(forever())
+        assert started.wait(5)
+        assert future.cancel()
+        assert cancelled.wait(5)
+
+
+def test_loop_pool_close_cancels_tasks() -> None:
+    started = threading.Event()
+    cleaned_up: list[bool] = []
+
+    async def forever() -> None:
+        started.set()
+        try:
+            await asyncfusion.sleep(3600)
+        finally:
+            cleaned_up.append(True)
+
+    pool = asyncfusion.LoopPool(1)
+    pool.start()
+    future = pool.spawn(forever())
+    assert started.wait(5)
+    pool.close()
+    assert cleaned_up == [True]
+    assert future.done()
+
+
+def test_loop_pool_failed_start(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(self: asyncfusion.EventLoop) -> None:
+        raise OSError("no ring for you")
+
+    monkeypatch.setattr(asyncfusion.EventLoop, "_init_uring", fail)
+    with pytest.raises(RuntimeError, match="failed to start") as exc:
+        asyncfusion.LoopPool(2).start()
+
+    assert isinstance(exc.value.__cause__, OSError)
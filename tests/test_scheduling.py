@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+
+import asyncfusion
+
+var: ContextVar[str] = ContextVar("var", default="unset")
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+def test_eager_task_runs_until_first_suspension() -> None:
+    events: list[str] = []
+
+    async def child() -> None:
+        events.append("child started")
+        await asyncfusion.sleep(0)
+        events.append("child resumed")
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            tg.create_task(child(), eager=True)
+            events.append("create_task returned")
+
+    asyncfusion.run(main())
+    assert events == ["child started", "create_task returned", "child resumed"]
+
+
+def test_eager_task_finishing_synchronously() -> None:
+    async def child() -> int:
+        return 42
+
+    async def main() -> tuple[bool, int]:
+        async with asyncfusion.TaskGroup() as tg:
+            task = tg.create_task(child(), eager=True)
+            done = task.done()
+
+        return done, task.result()
+
+    assert asyncfusion.run(main()) == (True, 42)
+
+
+def test_eager_tasks_loop_option() -> None:
+    events: list[str] = []
+
+    async def child() -> None:
+        events.append("child started")
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            tg.create_task(child())
+            events.append("create_task returned")
+
+    asyncfusion.EventLoop(eager_tasks=True).run_until_complete(main())
+    assert events == ["child started", "create_task returned"]
+
+
+def test_lazy_task_starts_after_create_task_returns() -> None:
+    events: list[str] = []
+
+    async def child() -> None:
+        events.append("child started")
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            tg.create_task(child())
+            events.append("create_task returned")
+
+    asyncfusion.run(main())
+    assert events == ["create_task returned", "child started"]
+
+
+def test_priorities() -> None:
+    order: list[int] = []
+
+    async def child(priority: int) -> None:
+        await asyncfusion.sleep(0)
+        order.append(priority)
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            for priority in (0, 5, -1, 10):
+                tg.create_task(child(priority), priority=priority)
+
+    asyncfusion.run(main())
+    assert order == [10, 5, 0, -1]
+
+
+def test_same_priority_keeps_fifo_order() -> None:
+    order: list[int] = []
+
+    async def child(index: int) -> None:
+        await asyncfusion.sleep(0)
+        order.append(index)
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            tg.create_task(child(-1), priority=-1)
+            for index in range(5):
+                tg.create_task(child(index), priority=1)
+
+    asyncfusion.run(main())
+    assert order == [0, 1, 2, 3, 4, -1]
+
+
+def test_run_budget_defers_callbacks() -> None:
+    async def hog() -> None:
+        for _ in range(3):
+            busy_wait(0.01)
+            await asyncfusion.sleep(0)
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            for _ in range(3):
+                tg.create_task(hog())
+
+    loop = asyncfusion.EventLoop(run_budget=0.005)
+    loop.run_until_complete(main())
+    statistics = loop.statistics()
+    assert statistics.budget_exhaustions > 0
+    assert statistics.deferred_callbacks > 0
+
+
+def test_no_run_budget() -> None:
+    async def hog() -> None:
+        busy_wait(0.01)
+        await asyncfusion.sleep(0)
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            for _ in range(3):
+                tg.create_task(hog())
+
+    loop = asyncfusion.EventLoop(run_budget=None)
+    loop.run_until_complete(main())
+    assert loop.statistics().budget_exhaustions == 0
+
+
+def test_run_budget_keeps_order() -> None:
+    order: list[int] = []
+
+    async def child(index: int) -> None:
+        busy_wait(0.002)
+        await asyncfusion.sleep(0)
+        order.append(index)
+
+    async def main() -> None:
+        async with asyncfusion.TaskGroup() as tg:
+            for index in range(10):
+                tg.create_task(child(index))
+
+    asyncfusion.EventLoop(run_budget=0.001).run_until_complete(main())
+    assert order == list(range(10))
+
+
+def test_child_task_context() -> None:
+    async def child() -> str:
+        value = var.get()
+        var.set("child")
+        await asyncfusion.sleep(0)
+        return value
+
+    async def main() -> tuple[list[str], str]:
+        var.set("parent")
+        async with asyncfusion.TaskGroup() as tg:
+            tasks = [tg.create_task(child()) for _ in range(2)]
+
+        return [task.result() for task in tasks], var.get()
+
+    assert asyncfusion.run(main()) == (["parent", "parent"], "parent")
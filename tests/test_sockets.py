@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import socket
+import sys
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+import asyncfusion
+from asyncfusion import _sockets
+
+if sys.version_info < (3, 11):
+    from exceptiongroup import ExceptionGroup
+
+
+@pytest.fixture
+def server() -> Iterator[socket.socket]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        yield sock
+
+
+@pytest.fixture(autouse=True)
+def clear_preferred_families() -> Iterator[None]:
+    _sockets._preferred_families.clear()
+    yield
+    _sockets._preferred_families.clear()
+
+
+def fake_getaddrinfo(
+    monkeypatch: pytest.MonkeyPatch, addresses: list[tuple[socket.AddressFamily, str]]
+) -> None:
+    def getaddrinfo(host: str, port: int, *args: Any) -> list[Any]:
+        return [
+            (family, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, port))
+            for family, address in addresses
+        ]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+
+
+async def connect(host: str, port: int, **kwargs: Any) -> tuple[Any, int]:
+    sock = await asyncfusion.connect_tcp(host, port, **kwargs)
+    try:
+        return sock._sock.getpeername(), sock.family
+    finally:
+        sock.close()
+
+
+def test_connect_tcp(server: socket.socket) -> None:
+    port = server.getsockname()[1]
+    peer, family = asyncfusion.run(connect("127.0.0.1", port))
+    assert peer == ("127.0.0.1", port)
+    assert family == socket.AF_INET
+    assert _sockets._preferred_families == {"127.0.0.1": socket.AF_INET}
+
+
+def test_falls_back_to_next_address(
+    server: socket.socket, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Nothing listens on 127.0.0.2, so the first attempt is refused
+    port = server.getsockname()[1]
+    fake_getaddrinfo(
+        monkeypatch, [(socket.AF_INET, "127.0.0.2"), (socket.AF_INET, "127.0.0.1")]
+    )
+    peer, _ = asyncfusion.run(connect("example.test", port))
+    assert peer == ("127.0.0.1", port)
+
+
+def test_all_attempts_fail(
+    server: socket.socket, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    port = server.getsockname()[1]
+    fake_getaddrinfo(
+        monkeypatch, [(socket.AF_INET, "127.0.0.2"), (socket.AF_INET, "127.0.0.3")]
+    )
+    _sockets._preferred_families["example.test"] = socket.AF_INET
+    with pytest.raises(OSError, match="all connection attempts failed") as exc:
+        asyncfusion.run(connect("example.test", port))
+
+    assert isinstance(exc.value.__cause__, ExceptionGroup)
+    assert len(exc.value.__cause__.exceptions) == 2
+    assert "example.test" not in _sockets._preferred_families
+
+
+def test_stale_preferred_family(
+    server: socket.socket, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # The cached family is tried first, but its connection fails, so the other family
+    # still gets its turn and becomes the preferred one
+    port = server.getsockname()[1]
+    fake_getaddrinfo(
+        monkeypatch, [(socket.AF_INET6, "::1"), (socket.AF_INET, "127.0.0.1")]
+    )
+    _sockets._preferred_families["example.test"] = socket.AF_INET6
+    peer, family = asyncfusion.run(
+        connect("example.test", port, happy_eyeballs_delay=0.05)
+    )
+    assert peer == ("127.0.0.1", port)
+    assert family == socket.AF_INET
+    assert _sockets._preferred_families["example.test"] == socket.AF_INET
+
+
+def test_dead_preferred_family(
+    server: socket.socket, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # The cached family's connection attempt hangs, so the other family is raced
+    # against it after the happy eyeballs delay
+    port = server.getsockname()[1]
+    fake_getaddrinfo(
+        monkeypatch, [(socket.AF_INET6, "::1"), (socket.AF_INET, "127.0.0.1")]
+    )
+    original_connect = asyncfusion.AsyncSocket.connect
+
+    async def connect_or_hang(self: asyncfusion.AsyncSocket, address: Any) -> None:
+        if self.family == socket.AF_INET6:
+            await asyncfusion.sleep(3600)
+
+        await original_connect(self, address)
+
+    monkeypatch.setattr(asyncfusion.AsyncSocket, "connect", connect_or_hang)
+    _sockets._preferred_families["example.test"] = socket.AF_INET6
+    peer, family = asyncfusion.run(
+        connect("example.test", port, happy_eyeballs_delay=0.05)
+    )
+    assert peer == ("127.0.0.1", port)
+    assert _sockets._preferred_families["example.test"] == socket.AF_INET
+
+
+def test_preferred_family_goes_first(
+    server: socket.socket, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    port = server.getsockname()[1]
+    fake_getaddrinfo(
+        monkeypatch, [(socket.AF_INET6, "::1"), (socket.AF_INET, "127.0.0.1")]
+    )
+    _sockets._preferred_families["example.test"] = socket.AF_INET
+    peer, family = asyncfusion.run(
+        connect("example.test", port, happy_eyeballs_delay=3600)
+    )
+    assert peer == ("127.0.0.1", port)
+    assert family == socket.AF_INET
+
+
+def test_interleave_families() -> None:
+    def info(family: socket.AddressFamily, address: str) -> Any:
+        return (family, socket.SOCK_STREAM, 0, "", (address, 80))
+
+    addrinfo = [
+        info(socket.AF_INET6, "::1"),
+        info(socket.AF_INET6, "::2"),
+        info(socket.AF_INET, "127.0.0.1"),
+    ]
+    interleaved = _sockets._interleave_families(addrinfo, None)
+    assert [item[4][0] for item in interleaved] == ["::1", "127.0.0.1", "::2"]
+    interleaved = _sockets._interleave_families(addrinfo, socket.AF_INET)
+    assert [item[4][0] for item in interleaved] == ["127.0.0.1", "::1", "::2"]
+
+
+def test_losing_attempts_are_closed(
+    server: socket.socket, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    port = server.getsockname()[1]
+    fake_getaddrinfo(
+        monkeypatch, [(socket.AF_INET, "127.0.0.1"), (socket.AF_INET, "127.0.0.1")]
+    )
+    opened: list[asyncfusion.AsyncSocket] = []
+    original_init = asyncfusion.AsyncSocket.__init__
+
+    def init(self: asyncfusion.AsyncSocket, *args: Any, **kwargs: Any) -> None:
+        original_init(self, *args, **kwargs)
+        opened.append(self)
+
+    monkeypatch.setattr(asyncfusion.AsyncSocket, "__init__", init)
+    asyncfusion.run(connect("example.test", port, happy_eyeballs_delay=0))
+    assert opened
+    assert all(sock._sock.fileno() == -1 for sock in opened)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncfusion
+
+
+def test_as_completed_early_exit_cancels_remaining() -> None:
+    cancelled: list[int] = []
+
+    async def sleeper(delay: float) -> float:
+        try:
+            await asyncfusion.sleep(delay)
+        except asyncfusion.CancelledError:
+            cancelled.append(int(delay))
+            raise
+
+        return delay
+
+    async def main() -> list[float]:
+        results: list[float] = []
+        async with asyncfusion.as_completed(
+            [sleeper(0), sleeper(3600), sleeper(7200)]
+        ) as tasks:
+            async for task in tasks:
+                results.append(task.result())
+                break
+
+        return results
+
+    assert asyncfusion.run(main()) == [0]
+    assert sorted(cancelled) == [3600, 7200]
+
+
+def test_as_completed_exhausted() -> None:
+    async def identity(value: int) -> int:
+        await asyncfusion.sleep(0)
+        return value
+
+    async def main() -> list[int]:
+        async with asyncfusion.as_completed(identity(i) for i in range(3)) as tasks:
+            return sorted([task.result() async for task in tasks])
+
+    assert asyncfusion.run(main()) == [0, 1, 2]